@@ -1,11 +1,96 @@
 import os
+import argparse
 from utils.builder import HighlySecureFlutterDocsBuilder
 from utils.config import Config
+from utils.render_cache import RenderCache
+from utils.watcher import DocsWatcher
+from utils.profiler import BuildProfiler
 
 def main():
     """執行超安全 Flutter 文件建構程式。"""
-    builder = HighlySecureFlutterDocsBuilder()
-    builder.build()
+    parser = argparse.ArgumentParser(description='建置超安全 Flutter 文件')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='停用 Markdown 轉換與程式碼高亮快取，強制重新轉換所有文件')
+    parser.add_argument('--clear-cache', action='store_true',
+                        help='建置前清除 Markdown 轉換與程式碼高亮快取')
+    parser.add_argument('--workers', type=int, default=Config.RENDER_WORKERS,
+                        help='平行轉換 Markdown 的工作程序數量（0 表示使用全部 CPU 核心）')
+    parser.add_argument('--highlight', choices=['server', 'client-lazy', 'none'], default=Config.HIGHLIGHT_STRATEGY,
+                        help='語法高亮策略：server 建置時高亮、client-lazy 瀏覽器逐分頁高亮、none 不高亮')
+    parser.add_argument('--compress-tabs', action='store_true',
+                        help='以 deflate 壓縮每個分頁的 HTML 內嵌於輸出檔，開啟分頁時才解壓縮')
+    parser.add_argument('--split-output', metavar='DIR', nargs='?', const=Config.SPLIT_OUTPUT_DIR,
+                        help=f'分檔輸出到目錄（預設 {Config.SPLIT_OUTPUT_DIR}）：index.html、分頁片段與以內容雜湊命名的 CSS/JS')
+    parser.add_argument('--vendor', metavar='DIR', nargs='?', const=Config.VENDOR_DIR,
+                        help=f'改用本機 vendor 目錄（預設 {Config.VENDOR_DIR}）中的 CDN 資源，輸出可離線使用的檔案')
+    parser.add_argument('--no-icon-sprite', action='store_true',
+                        help='保留 Font Awesome 樣式表與網頁字型，不改用內嵌 SVG 圖示')
+    parser.add_argument('--no-purge-css', action='store_true',
+                        help='保留所有 CSS 規則，不移除頁面沒有用到的樣式')
+    parser.add_argument('--no-minify', action='store_true',
+                        help='不壓縮輸出的 HTML、CSS 與 JavaScript（方便除錯）')
+    parser.add_argument('--precompress', action='store_true',
+                        help='在輸出檔旁寫入 .gz（以及安裝 brotli 時的 .br）預先壓縮檔，並比較各壓縮等級')
+    parser.add_argument('--encryption', choices=['aes-gcm', 'chunked', 'legacy'], default=Config.ENCRYPTION_FORMAT,
+                        help='secrets 內容的加密格式：aes-gcm（需要 cryptography，瀏覽器以 WebCrypto 解密；大型內容自動分塊）、'
+                             'chunked（一律使用分塊容器）或舊版 legacy')
+    parser.add_argument('--password-verifier', choices=['pbkdf2', 'legacy'], default=Config.PASSWORD_VERIFIER,
+                        help=f'密碼驗證資料格式：pbkdf2（{Config.PASSWORD_VERIFIER_ITERATIONS} 次迭代，瀏覽器一次原生呼叫）或舊版 legacy')
+    parser.add_argument('--watch', action='store_true',
+                        help='持續監看內容目錄，文件變動時只重新轉換有變動的文件')
+    parser.add_argument('--profile', action='store_true',
+                        help='輸出各建置階段的時間與記憶體量測表格')
+    parser.add_argument('--profile-json', metavar='PATH',
+                        help='將各建置階段的量測結果寫入 JSON 檔案')
+    parser.add_argument('--profile-no-memory', action='store_true',
+                        help='量測時不追蹤記憶體峰值（tracemalloc 會拖慢 Markdown 轉換）')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='輸出 Chrome / Perfetto trace event 檔案，可在 trace 檢視器中查看火焰圖')
+    args = parser.parse_args()
+
+    if args.clear_cache:
+        RenderCache(Config.CACHE_DIR, Config.CACHE_MAX_BYTES, Config.MARKDOWN_EXTENSIONS).clear()
+        RenderCache(Config.HIGHLIGHT_CACHE_DIR, Config.HIGHLIGHT_CACHE_MAX_BYTES, ['codehilite']).clear()
+        print(f"🧹 Cleared render cache: {Config.CACHE_DIR}, {Config.HIGHLIGHT_CACHE_DIR}")
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    builder = HighlySecureFlutterDocsBuilder(
+        use_cache=not args.no_cache, workers=workers, highlight_strategy=args.highlight,
+        compress_tabs=args.compress_tabs or None, split_output=args.split_output, vendor_dir=args.vendor,
+        purge_css=False if args.no_purge_css else None, icon_sprite=False if args.no_icon_sprite else None,
+        minify=False if args.no_minify else None, precompress=args.precompress or None,
+        encryption_format=args.encryption, password_verifier=args.password_verifier
+    )
+    profiler = None
+    if args.profile or args.profile_json or args.trace:
+        # 只輸出 trace 時不追蹤記憶體，避免 tracemalloc 扭曲時間軸
+        trace_memory = (args.profile or args.profile_json) and not args.profile_no_memory
+        profiler = BuildProfiler(trace_memory=trace_memory).start()
+
+    if args.watch:
+        DocsWatcher(builder).run()
+    else:
+        builder.build()
+
+    if profiler is not None:
+        profiler.stop()
+        if args.profile:
+            print("\n📊 Build profile:")
+            print(profiler.format_table())
+        if args.profile_json:
+            try:
+                with open(args.profile_json, 'w', encoding='utf-8') as file:
+                    file.write(profiler.to_json())
+                print(f"📊 Profile written to {args.profile_json}")
+            except IOError as e:
+                print(f"❌ Error writing to {args.profile_json}: {str(e)}")
+        if args.trace:
+            try:
+                with open(args.trace, 'w', encoding='utf-8') as file:
+                    file.write(profiler.to_trace_events())
+                print(f"🧭 Trace written to {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+            except IOError as e:
+                print(f"❌ Error writing to {args.trace}: {str(e)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
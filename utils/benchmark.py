@@ -0,0 +1,416 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from contextlib import redirect_stdout
+
+from utils.config import Config
+from utils.markdown_processor import MarkdownProcessor
+from utils.markdown_splitter import MarkdownSplitter
+from utils.synthetic_corpus import SyntheticCorpus
+from utils.builder import HighlySecureFlutterDocsBuilder
+from utils.encryption import Encryption
+from utils.decoy import Decoy
+from utils.highlight_strategy import HighlightStrategy, STRATEGIES
+from utils.javascript import JavaScriptGenerator
+from utils.html_template import HTMLTemplate
+from utils.profiler import BuildProfiler
+
+# 基準檔格式版本
+BASELINE_VERSION = 1
+# 兩邊都低於此耗時的階段不判定退化，避免毫秒級雜訊造成誤報
+MIN_COMPARE_SECONDS = 0.01
+# 加密吞吐量比較的預設資料大小：10 KB、1 MB、50 MB
+ENCRYPTION_SIZES = [10 * 1024, 1024 * 1024, 50 * 1024 * 1024]
+# 解鎖延遲比較的 PBKDF2 迭代次數
+UNLOCK_ITERATIONS = [100000, 310000, 600000]
+
+
+class BuildBenchmark:
+    @staticmethod
+    def load_documents(content_dir):
+        """讀取內容目錄中所有公開的 Markdown 文件。"""
+        md_files = [f for f in os.listdir(content_dir) if f.endswith('.md') and f != 'secrets.md']
+        md_files.sort(key=MarkdownProcessor.extract_order_from_filename)
+        documents = []
+        for filename in md_files:
+            with open(os.path.join(content_dir, filename), 'r', encoding='utf-8') as file:
+                documents.append((filename, file.read()))
+        return documents
+
+    @staticmethod
+    def time_render(documents, workers, repeat):
+        """以指定的工作程序數量轉換文件，回傳最佳耗時與轉換結果。"""
+        best = None
+        rendered = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rendered = MarkdownProcessor.render_documents(documents, cache=None, workers=workers)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, rendered
+
+    @staticmethod
+    def compare_parallel_render(content_dir, worker_counts, repeat):
+        """比較逐一轉換與平行轉換的耗時，並確認輸出完全一致。"""
+        documents = BuildBenchmark.load_documents(content_dir)
+        total_bytes = sum(len(content.encode('utf-8')) for _, content in documents)
+        print(f"📄 {len(documents)} files, {total_bytes / 1024:.1f} KB, best of {repeat}")
+
+        serial_time, serial_result = BuildBenchmark.time_render(documents, 1, repeat)
+        print(f"   workers= 1  {serial_time:8.3f}s  (baseline)")
+
+        identical = True
+        for workers in worker_counts:
+            if workers <= 1:
+                continue
+            elapsed, result = BuildBenchmark.time_render(documents, workers, repeat)
+            same = result == serial_result
+            identical = identical and same
+            print(f"   workers={workers:2d}  {elapsed:8.3f}s  x{serial_time / elapsed:5.2f}  "
+                  f"{'identical' if same else 'MISMATCH'}")
+        return identical
+
+    @staticmethod
+    def verify_split_render(content_dir, chunk_sizes):
+        """確認切割後逐塊轉換再接回的結果與整份轉換完全相同。"""
+        all_identical = True
+        for filename, content in BuildBenchmark.load_documents(content_dir):
+            whole = MarkdownProcessor.render_markdown(content)
+            for chunk_bytes in chunk_sizes:
+                chunks = MarkdownSplitter.split_into_chunks(content, chunk_bytes)
+                stitched = MarkdownSplitter.stitch([
+                    MarkdownProcessor.render_chunk(chunk, index < len(chunks) - 1)[0]
+                    for index, chunk in enumerate(chunks)
+                ])
+                same = stitched == whole
+                all_identical = all_identical and same
+                print(f"   {filename:<28} chunk>={chunk_bytes:>6}B  {len(chunks):3d} chunks  "
+                      f"{'identical' if same else 'MISMATCH'}")
+        return all_identical
+
+    @staticmethod
+    def compare_highlight_strategies(content_dir, repeat, workers):
+        """以各種語法高亮策略建置，比較輸出大小、建置時間與瀏覽器載入時需要高亮的區塊數。"""
+        work_dir = tempfile.mkdtemp(prefix='flutter-docs-highlight-')
+        reports = []
+        try:
+            for strategy in STRATEGIES:
+                builder = HighlySecureFlutterDocsBuilder(use_cache=False, workers=workers, highlight_strategy=strategy)
+                builder.content_dir = content_dir
+                builder.output_file = os.path.join(work_dir, f"{strategy}.html")
+                elapsed, _ = BuildBenchmark.best_time(builder.build, repeat)
+                reports.append((elapsed, builder.highlight_report))
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+            HighlightStrategy.use(Config.HIGHLIGHT_STRATEGY)
+
+        base_bytes = reports[0][1]['output_bytes']
+        print(f"   {'Strategy':<13}{'Output':>11}{'vs server':>11}{'Markup':>11}{'Build':>9}  Browser highlights at load")
+        for elapsed, report in reports:
+            change = report['output_bytes'] / base_bytes - 1
+            print(f"   {report['strategy']:<13}{report['output_bytes'] / 1024:9.1f}KB{change:+10.1%}"
+                  f"{(report['markup_bytes'] + report['stylesheet_bytes']) / 1024:9.1f}KB{elapsed:8.3f}s  "
+                  f"{report['client_blocks_at_load']}/{report['code_blocks']} block(s)")
+        return reports
+
+    @staticmethod
+    def compare_encryption(sizes, repeat, password=Config.SECRET_PASSWORD):
+        """比較逐位元組與整段運算的密碼 XOR + 混淆吞吐量，並確認兩者輸出完全相同。
+
+        逐位元組版本在 1 MB 以上的資料只執行一次。
+        """
+        all_identical = True
+        print(f"   {'Size':>9}{'Bytewise':>12}{'Bulk':>12}{'Bytewise MB/s':>15}{'Bulk MB/s':>12}{'Speedup':>9}  Output")
+        for size in sizes:
+            data = random.Random(size).randbytes(size)
+
+            def bytewise():
+                return Encryption.enhanced_obfuscate_bytewise(Encryption.password_xor_bytewise(data, password), password)
+
+            def bulk():
+                return Encryption.enhanced_obfuscate(Encryption.password_xor(data, password), password)
+
+            bytewise_time, expected = BuildBenchmark.best_time(bytewise, repeat if size < 1024 * 1024 else 1)
+            bulk_time, result = BuildBenchmark.best_time(bulk, repeat)
+            same = result == expected
+            all_identical = all_identical and same
+            megabytes = size / (1024 * 1024)
+            print(f"   {BuildProfiler.format_bytes(size):>9}{bytewise_time:11.3f}s{bulk_time:11.4f}s"
+                  f"{megabytes / bytewise_time:15.1f}{megabytes / bulk_time:12.1f}{bytewise_time / bulk_time:8.0f}x  "
+                  f"{'identical' if same else 'MISMATCH'}")
+        return all_identical
+
+    @staticmethod
+    def measure_unlock_js(verifiers, password, repeat):
+        """以 node 執行產生的 JavaScript 驗證函數（WebCrypto），回傳各驗證資料的最佳耗時；沒有 node 時回傳 None。"""
+        node = shutil.which('node')
+        if node is None:
+            return None
+        script = f'''
+            const print = console.log;
+            console.log = () => {{}};
+            {JavaScriptGenerator._generate_password_functions()}
+            (async () => {{
+                const results = [];
+                for (const verifier of {json.dumps(verifiers)}) {{
+                    let best = Infinity, valid = false;
+                    for (let i = 0; i < {repeat}; i++) {{
+                        const start = performance.now();
+                        valid = await verifyPasswordHash({json.dumps(password)}, verifier);
+                        best = Math.min(best, performance.now() - start);
+                    }}
+                    results.push([best / 1000, valid]);
+                }}
+                print(JSON.stringify(results));
+            }})();
+        '''
+        completed = subprocess.run([node, '-e', script], capture_output=True, text=True, check=True)
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+
+    @staticmethod
+    def compare_unlock(iterations_list, repeat, password=Config.SECRET_PASSWORD):
+        """比較舊版雜湊（5000 次 SHA-256 鏈）與 PBKDF2 驗證資料的解鎖延遲。
+
+        Python 欄位是建置時生成驗證資料的耗時；有 node 時另外以產生的 JavaScript 驗證函數量測前端解鎖的耗時
+        （舊版每次迭代都要等待一次 crypto.subtle.digest 的 Promise）。
+        """
+        cases = [('legacy sha256 x5000', lambda: Encryption.generate_password_hash(password))]
+        for iterations in iterations_list:
+            cases.append((f"pbkdf2 x{iterations}", lambda iterations=iterations: Encryption.pbkdf2_verifier(
+                password, iterations)))
+        timings = [BuildBenchmark.best_time(function, repeat) for _, function in cases]
+        js_timings = BuildBenchmark.measure_unlock_js([verifier for _, verifier in timings], password, repeat)
+
+        all_valid = True
+        print(f"   {'Verifier':<22}{'Python':>10}{'JS unlock':>12}  Result")
+        for index, (label, _) in enumerate(cases):
+            python_time = timings[index][0]
+            if js_timings is None:
+                print(f"   {label:<22}{python_time * 1000:8.1f}ms{'n/a':>12}")
+                continue
+            js_time, valid = js_timings[index]
+            all_valid = all_valid and valid
+            print(f"   {label:<22}{python_time * 1000:8.1f}ms{js_time * 1000:10.1f}ms  {'ok' if valid else 'MISMATCH'}")
+        if js_timings is None:
+            print("   node not found, skipping the JavaScript unlock measurement")
+        return all_valid
+
+    @staticmethod
+    def best_time(function, repeat):
+        """重複執行函式並回傳最佳耗時與最後一次的結果（隱藏建置過程的輸出）。"""
+        best = None
+        result = None
+        for _ in range(repeat):
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                result = function()
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    @staticmethod
+    def run_scale(profile, scale, repeat, workers):
+        """產生指定倍率的語料，分別量測完整建置與各階段。"""
+        documents = SyntheticCorpus.generate(profile, scale)
+        public_documents = [(filename, content) for filename, content in documents if filename != 'secrets.md']
+        secret_content = next((content for filename, content in documents if filename == 'secrets.md'), '')
+        password = Config.SECRET_PASSWORD
+        work_dir = tempfile.mkdtemp(prefix='flutter-docs-bench-')
+        stages = {}
+        try:
+            content_dir = os.path.join(work_dir, 'content')
+            SyntheticCorpus.write(documents, content_dir)
+            filenames = [filename for filename, _ in documents]
+
+            stages['file read'], _ = BuildBenchmark.best_time(
+                lambda: MarkdownProcessor.read_documents(content_dir, filenames), repeat)
+            stages['title extraction'], _ = BuildBenchmark.best_time(
+                lambda: [MarkdownProcessor.extract_title_from_content(content) for _, content in documents], repeat)
+            stages['language resolution'], resolved_documents = BuildBenchmark.best_time(
+                lambda: MarkdownProcessor.resolve_code_languages(public_documents, Config.DEFAULT_CODE_LANGUAGE),
+                repeat)
+            stages['markdown render'], _ = BuildBenchmark.best_time(
+                lambda: MarkdownProcessor.render_documents(resolved_documents, cache=None, workers=workers), repeat)
+            # 與建置相同的加密格式（預設 AES-GCM，大型內容使用分塊容器）
+            stages['encryption'], encrypted = BuildBenchmark.best_time(
+                lambda: Encryption.encrypt_payload(secret_content, password), repeat)
+            stages['decoy generation'], _ = BuildBenchmark.best_time(
+                lambda: Decoy.create_decoy_data(len(encrypted), Encryption.payload_header(encrypted)), repeat)
+            stages['js generation'], _ = BuildBenchmark.best_time(
+                lambda: JavaScriptGenerator.generate_obfuscated_js(encrypted, password), repeat)
+
+            with redirect_stdout(io.StringIO()):
+                files_content = MarkdownProcessor.read_markdown_files(content_dir, password, None, workers)
+            stages['template assembly'], _ = BuildBenchmark.best_time(
+                lambda: HTMLTemplate.generate_html_template(files_content, password), repeat)
+
+            builder = HighlySecureFlutterDocsBuilder(use_cache=False, workers=workers)
+            builder.content_dir = content_dir
+            builder.output_file = os.path.join(work_dir, 'flutter-docs.html')
+            stages['full build'], _ = BuildBenchmark.best_time(builder.build, repeat)
+            output_bytes = os.path.getsize(builder.output_file)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        return {
+            'scale': scale,
+            'corpus_bytes': sum(len(content.encode('utf-8')) for _, content in documents),
+            'output_bytes': output_bytes,
+            'stages': stages
+        }
+
+    @staticmethod
+    def run_suite(content_dir, scales, repeat, workers):
+        """以實際文件的統計資料產生各倍率語料並執行量測。"""
+        profile = SyntheticCorpus.analyze(content_dir)
+        results = {}
+        for scale in scales:
+            # 大型語料只執行一次，避免整體耗時過長
+            scale_repeat = repeat if scale < 10 else 1
+            label = f"{scale:g}x"
+            print(f"⏱️ Running {label} corpus (best of {scale_repeat})...")
+            result = BuildBenchmark.run_scale(profile, scale, scale_repeat, workers)
+            results[label] = result
+            print(f"   corpus {result['corpus_bytes'] / 1024:.1f} KB -> output {result['output_bytes'] / 1024:.1f} KB")
+            for stage, seconds in result['stages'].items():
+                print(f"   {stage:<20}{seconds:10.3f}s")
+        return {
+            'version': BASELINE_VERSION,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'workers': workers,
+            'results': results
+        }
+
+    @staticmethod
+    def compare(baseline, current, threshold):
+        """比較兩份量測結果，回傳超過門檻的退化項目。"""
+        regressions = []
+        print(f"{'Scale':<8}{'Stage':<20}{'Baseline':>11}{'Current':>11}{'Change':>10}")
+        print('-' * 60)
+        for label, result in current['results'].items():
+            base_result = baseline['results'].get(label)
+            if base_result is None:
+                continue
+            for stage, seconds in result['stages'].items():
+                base_seconds = base_result['stages'].get(stage)
+                if not base_seconds or max(base_seconds, seconds) < MIN_COMPARE_SECONDS:
+                    continue
+                change = seconds / base_seconds - 1
+                flag = ''
+                if change > threshold:
+                    flag = '  ❌ regression'
+                    regressions.append((label, stage, change))
+                print(f"{label:<8}{stage:<20}{base_seconds:10.3f}s{seconds:10.3f}s{change:+9.1%}{flag}")
+        return regressions
+
+    @staticmethod
+    def load_results(path):
+        """讀取量測結果 JSON。"""
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+
+def main():
+    """主函數"""
+    parser = argparse.ArgumentParser(description='量測文件建置流程的效能')
+    parser.add_argument('--content-dir', default=Config.CONTENT_DIR,
+                        help='Markdown 內容目錄')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        help='要比較的平行工作程序數量（--suite 時使用其中最大值）')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='每種設定重複執行的次數（取最佳值）')
+    parser.add_argument('--verify-split', action='store_true',
+                        help='確認在標題處切割轉換的結果與整份轉換完全相同')
+    parser.add_argument('--highlight-strategies', action='store_true',
+                        help='比較 server、client-lazy、none 三種語法高亮策略的輸出大小與載入工作量')
+    parser.add_argument('--encryption', action='store_true',
+                        help='比較逐位元組與整段運算的加密吞吐量（10 KB、1 MB、50 MB）')
+    parser.add_argument('--encryption-sizes', type=int, nargs='+', default=ENCRYPTION_SIZES,
+                        help='加密吞吐量比較使用的資料大小（位元組）')
+    parser.add_argument('--unlock', action='store_true',
+                        help='比較舊版雜湊與 PBKDF2 密碼驗證資料的解鎖延遲（有 node 時包含前端 WebCrypto 耗時）')
+    parser.add_argument('--unlock-iterations', type=int, nargs='+', default=UNLOCK_ITERATIONS,
+                        help='解鎖延遲比較使用的 PBKDF2 迭代次數')
+    parser.add_argument('--suite', action='store_true',
+                        help='以合成語料量測完整建置與各階段耗時')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100],
+                        help='合成語料相對於實際文件的倍率（10x 以上只執行一次）')
+    parser.add_argument('--save', metavar='PATH',
+                        help='將量測結果存為 JSON 基準檔')
+    parser.add_argument('--compare', metavar='PATH', nargs='+',
+                        help='與基準檔比較：BASELINE [CURRENT]，未指定 CURRENT 時先執行量測')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='判定為效能退化的變化比例（預設 0.10 即慢 10%%）')
+    args = parser.parse_args()
+
+    if args.suite or args.compare:
+        suite_workers = max(args.workers) if args.workers else Config.RENDER_WORKERS
+        if args.compare and len(args.compare) > 1:
+            current = BuildBenchmark.load_results(args.compare[1])
+        else:
+            current = BuildBenchmark.run_suite(args.content_dir, args.scales, args.repeat, suite_workers)
+
+        if args.save:
+            with open(args.save, 'w', encoding='utf-8') as file:
+                json.dump(current, file, indent=2, ensure_ascii=False)
+            print(f"💾 Results saved to {args.save}")
+
+        if args.compare:
+            print(f"\n📊 Comparing against {args.compare[0]} (threshold {args.threshold:.0%})")
+            regressions = BuildBenchmark.compare(
+                BuildBenchmark.load_results(args.compare[0]), current, args.threshold
+            )
+            if regressions:
+                print(f"❌ {len(regressions)} stage(s) regressed beyond {args.threshold:.0%}")
+                sys.exit(1)
+            print("✅ No regressions")
+        return
+
+    if args.encryption:
+        print("🔐 Encryption throughput (password XOR + obfuscation)")
+        if not BuildBenchmark.compare_encryption(args.encryption_sizes, args.repeat):
+            print("❌ Bulk encryption output differs from the bytewise implementation")
+            sys.exit(1)
+        return
+
+    if args.unlock:
+        print("🔑 Unlock latency (password verifier)")
+        if not BuildBenchmark.compare_unlock(args.unlock_iterations, args.repeat):
+            print("❌ JavaScript verification does not match the Python verifier")
+            sys.exit(1)
+        return
+
+    if args.highlight_strategies:
+        print("🎨 Highlight strategy comparison")
+        BuildBenchmark.compare_highlight_strategies(
+            args.content_dir, args.repeat, max(args.workers) if args.workers else Config.RENDER_WORKERS
+        )
+        return
+
+    if args.verify_split:
+        print("🔍 Heading-split render verification")
+        if not BuildBenchmark.verify_split_render(args.content_dir, [1, 4096, Config.SPLIT_CHUNK_BYTES]):
+            print("❌ Split render differs from whole-file render")
+            sys.exit(1)
+        return
+
+    print("⏱️ Parallel Markdown render benchmark")
+    worker_counts = args.workers or [2, os.cpu_count() or 1]
+    identical = BuildBenchmark.compare_parallel_render(args.content_dir, sorted(set(worker_counts)), args.repeat)
+    if not identical:
+        print("❌ Parallel output differs from serial output")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
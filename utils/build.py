@@ -1,17 +1,24 @@
 import os
 import re
+import sys
 import base64
 import hashlib
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import markdown
+from utils.config import Config
+from utils.highlight_cache import HighlightCache
 
 class FlutterDocsBuilder:
-    def __init__(self):
+    def __init__(self, use_cache=True):
         self.content_dir = "content"
         self.output_file = "flutter-docs-updated.html"
         self.secret_password = "19831203"
+        self.highlight_cache = None
+        HighlightCache.disable()
+        if use_cache:
+            self.highlight_cache = HighlightCache.enable(Config.HIGHLIGHT_CACHE_DIR, Config.HIGHLIGHT_CACHE_MAX_BYTES)
         
     def generate_key_from_password(self, password):
         """Generate a 256-bit AES key from the password using PBKDF2"""
@@ -82,7 +89,7 @@ class FlutterDocsBuilder:
                     'order': self.extract_order_from_filename(filename)
                 }
             else:
-                html_content = markdown.markdown(content, extensions=['codehilite', 'fenced_code'])
+                html_content = markdown.markdown(content, extensions=['codehilite', 'fenced_code'] + HighlightCache.extensions())
                 files_content[filename] = {
                     'title': title,
                     'content': html_content,
@@ -615,6 +622,10 @@ class FlutterDocsBuilder:
         if not files_content:
             print("❌ 錯誤：沒有找到任何 Markdown 檔案")
             return
+        if self.highlight_cache is not None:
+            hits, misses = self.highlight_cache.hits, self.highlight_cache.misses
+            hit_rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+            print(f"🎨 程式碼高亮快取：命中 {hits} 次，未命中 {misses} 次（命中率 {hit_rate:.1f}%）")
         print(f"📄 找到 {len(files_content)} 個檔案：")
         sorted_files = sorted(files_content.items(), key=lambda x: x[1]['order'])
         for filename, data in sorted_files:
@@ -630,5 +641,6 @@ class FlutterDocsBuilder:
         print("💡 提示：點擊標題中的火箭圖標來訪問隱藏內容！🚀")
 
 if __name__ == "__main__":
-    builder = FlutterDocsBuilder()
+    # 以 python -m utils.build 執行；--no-cache 停用程式碼高亮快取
+    builder = FlutterDocsBuilder(use_cache='--no-cache' not in sys.argv)
     builder.build()
\ No newline at end of file
@@ -4,12 +4,56 @@ from utils.config import Config
 from utils.markdown_processor import MarkdownProcessor
 from utils.html_template import HTMLTemplate
 from utils.encryption import Encryption  # 修正：新增缺少的 Encryption 匯入
+from utils.render_cache import RenderCache
+from utils.highlight_cache import HighlightCache
+from utils.highlight_strategy import HighlightStrategy
+from utils.profiler import BuildProfiler
+from utils.split_output import SplitOutputWriter
+from utils.vendor import AssetVendor
+from utils.css_purge import CssPurger
+from utils.icon_sprite import IconSprite
+from utils.minify import Minifier
+from utils.precompress import Precompressor
 
 class HighlySecureFlutterDocsBuilder:
-    def __init__(self):
+    def __init__(self, use_cache=True, workers=None, highlight_strategy=None, compress_tabs=None, split_output=None,
+                 vendor_dir=None, purge_css=None,
+                 icon_sprite=None, minify=None, precompress=None, encryption_format=None,
+                 password_verifier=None):
         self.content_dir = Config.CONTENT_DIR
         self.output_file = Config.OUTPUT_FILE
         self.secret_password = Config.SECRET_PASSWORD
+        self.workers = Config.RENDER_WORKERS if workers is None else workers
+        self.highlight_strategy = HighlightStrategy.use(
+            Config.HIGHLIGHT_STRATEGY if highlight_strategy is None else highlight_strategy
+        )
+        self.highlight_report = None
+        self.compress_tabs = Config.COMPRESS_TABS if compress_tabs is None else compress_tabs
+        # 設定輸出目錄時改為分檔輸出（index.html 外殼 + 分頁片段 + 雜湊命名的 CSS/JS）
+        self.split_output = split_output
+        # 設定 vendor 目錄時，CDN 資源改為內嵌（或分檔輸出時放在 assets/）本機檔案
+        self.vendor_dir = vendor_dir
+        self.purge_css = Config.PURGE_CSS if purge_css is None else purge_css
+        self.icon_sprite = Config.ICON_SPRITE if icon_sprite is None else icon_sprite
+        self.minify = Config.MINIFY_OUTPUT if minify is None else minify
+        # 在輸出檔旁寫入 .gz / .br 預先壓縮檔
+        self.precompress = Config.PRECOMPRESS if precompress is None else precompress
+        self.encryption_format = Encryption.use(
+            Config.ENCRYPTION_FORMAT if encryption_format is None else encryption_format
+        )
+        self.password_verifier = Encryption.use_verifier(
+            Config.PASSWORD_VERIFIER if password_verifier is None else password_verifier
+        )
+        self.output_paths = []
+        self.cache = None
+        self.highlight_cache = None
+        HighlightCache.disable()
+        if use_cache:
+            self.cache = RenderCache(
+                Config.CACHE_DIR, Config.CACHE_MAX_BYTES,
+                Config.MARKDOWN_EXTENSIONS, HighlightStrategy.extension_configs()
+            )
+            self.highlight_cache = HighlightCache.enable(Config.HIGHLIGHT_CACHE_DIR, Config.HIGHLIGHT_CACHE_MAX_BYTES)
         
     def build(self):
         """建立高度安全的 Flutter 文件。"""
@@ -21,7 +65,7 @@ class HighlySecureFlutterDocsBuilder:
             files_content = {
                 '01_introduction.md': {
                     'title': 'Introduction to Flutter',
-                    'content': markdown.markdown('# Introduction to Flutter\nThis is a sample introduction.', extensions=['codehilite', 'fenced_code']),
+                    'content': MarkdownProcessor.render_markdown('# Introduction to Flutter\nThis is a sample introduction.'),
                     'is_encrypted': False,
                     'order': 1
                 },
@@ -29,14 +73,22 @@ class HighlySecureFlutterDocsBuilder:
                     'title': '',
                     'original_title': 'Secrets',
                     'content': '# Secret Content\nThis is hidden content.',
-                    'encrypted_content': Encryption.advanced_encrypt('# Secret Content\nThis is hidden content.', self.secret_password),
+                    'encrypted_content': Encryption.encrypt_payload('# Secret Content\nThis is hidden content.', self.secret_password),
                     'is_encrypted': True,
                     'is_hidden': True,
                     'order': 2
                 }
             }
         else:
-            files_content = MarkdownProcessor.read_markdown_files(self.content_dir, self.secret_password)
+            files_content = MarkdownProcessor.read_markdown_files(
+                self.content_dir, self.secret_password, self.cache, self.workers
+            )
+            if self.cache is not None:
+                print(f"🗄️ Render cache: {self.cache.hits} hit(s), {self.cache.misses} miss(es)")
+            if self.highlight_cache is not None:
+                hits, misses = self.highlight_cache.hits, self.highlight_cache.misses
+                hit_rate = hits / (hits + misses) * 100 if hits + misses else 0.0
+                print(f"🎨 Highlight cache: {hits} hit(s), {misses} miss(es) ({hit_rate:.1f}% hit rate)")
         
         if not files_content:
             print("❌ Error: No Markdown files found")
@@ -50,17 +102,19 @@ class HighlySecureFlutterDocsBuilder:
             title = data['title'] if data['title'] else data.get('original_title', filename)
             print(f"  {order:2d}. {filename} - {title} {encryption_status}")
         
-        html_content = HTMLTemplate.generate_html_template(files_content, self.secret_password)
-        
-        try:
-            with open(self.output_file, 'w', encoding='utf-8') as file:
-                file.write(html_content)
-        except IOError as e:
-            print(f"❌ Error writing to {self.output_file}: {str(e)}")
+        if not self.write_output(files_content):
             return
         
         print(f"✅ Ultra-secure documentation built successfully!")
-        print(f"📁 Output file: {self.output_file}")
+        if self.split_output:
+            print(f"📁 Output directory: {self.split_output}")
+        else:
+            print(f"📁 Output file: {self.output_file}")
+        report = self.highlight_report
+        if report is not None:
+            print(f"🎨 Highlight strategy: {report['strategy']} — output {BuildProfiler.format_bytes(report['output_bytes'])}, "
+                  f"highlight markup {BuildProfiler.format_bytes(report['markup_bytes'] + report['stylesheet_bytes'])}, "
+                  f"{report['client_blocks_at_load']}/{report['code_blocks']} code block(s) highlighted in the browser at load")
         print(f"🔐 Encrypted file password: {self.secret_password}")
         print("\n🛡️ Security Features:")
         print("   • Multi-layer encryption (Compression + AES + Obfuscation)")
@@ -74,6 +128,80 @@ class HighlySecureFlutterDocsBuilder:
         print("\n⚠️ Important Note:")
         print("   Although significantly increasing cracking difficulty, client-side encryption has theoretical limitations.")
         print("   This solution effectively prevents 95% of general cracking attempts.")
+        return files_content
+    
+    def finalize_html(self, html_content, files_content, minifier=None):
+        """輸出前的後處理：圖示改為 SVG sprite、內嵌 vendor 資源、移除沒有用到的 CSS 規則，最後壓縮 HTML/CSS/JS。
+
+        分檔輸出時傳入壓縮分頁片段用的 minifier，統計會合併在同一份報告中。
+        """
+        if self.icon_sprite:
+            sprite = IconSprite(self.vendor_dir or Config.VENDOR_DIR)
+            with BuildProfiler.track('icon sprite'):
+                html_content = sprite.apply(html_content)
+            sprite.report()
+        purger = None
+        if self.purge_css:
+            # 在內嵌 vendor 腳本前收集用到的識別字，避免函式庫程式碼中的類別名稱被當成有用到
+            purger = CssPurger(CssPurger.used_tokens(html_content, files_content))
+        if self.vendor_dir:
+            vendor = AssetVendor(self.vendor_dir, AssetVendor.code_languages(files_content))
+            with BuildProfiler.track('vendoring'):
+                html_content = vendor.vendor_html(html_content)
+            vendor.report()
+        if purger is not None:
+            with BuildProfiler.track('css purge'):
+                html_content = purger.purge_html(html_content)
+            purger.report()
+        if self.minify:
+            minifier = minifier or Minifier()
+            with BuildProfiler.track('minify'):
+                html_content = minifier.minify_html(html_content)
+            minifier.report()
+        return html_content
+
+    def write_output(self, files_content):
+        """組合 HTML 模板並寫入輸出檔案（監看模式重建時也會更新預先壓縮檔）。"""
+        if not self.write_files(files_content):
+            return False
+        if self.precompress:
+            Precompressor(self.workers).run(self.output_paths).report()
+        return True
+
+    def write_files(self, files_content):
+        """組合 HTML 模板並寫入輸出檔案，記錄寫入的路徑。"""
+        if self.split_output:
+            self.highlight_report = None
+            minifier = Minifier() if self.minify else None
+            try:
+                manifest = SplitOutputWriter(self.split_output, minifier).write(
+                    files_content, self.secret_password,
+                    lambda shell: self.finalize_html(shell, files_content, minifier)
+                )
+            except (IOError, OSError) as e:
+                print(f"❌ Error writing to {self.split_output}: {str(e)}")
+                return False
+            self.output_paths = [
+                os.path.join(self.split_output, relative_path)
+                for relative_path in ['index.html', 'manifest.json', *manifest['tabs'].values(), *manifest['assets']]
+            ]
+            return True
+        
+        with BuildProfiler.track('template assembly'):
+            html_content = HTMLTemplate.generate_html_template(
+                files_content, self.secret_password, self.compress_tabs
+            )
+        html_content = self.finalize_html(html_content, files_content)
+        self.highlight_report = HighlightStrategy.report(files_content, html_content)
+        
+        try:
+            with BuildProfiler.track('write'), open(self.output_file, 'w', encoding='utf-8') as file:
+                file.write(html_content)
+        except IOError as e:
+            print(f"❌ Error writing to {self.output_file}: {str(e)}")
+            return False
+        self.output_paths = [self.output_file]
+        return True
 
 # 修正：新增 main 執行區塊（如果需要直接執行此檔案）
 if __name__ == "__main__":
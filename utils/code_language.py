@@ -0,0 +1,108 @@
+import os
+import re
+import json
+import hashlib
+from utils.config import Config
+
+FENCE_PATTERN = re.compile(r'^(\s*)(`{3,}|~{3,})(.*)$')
+# 目錄樹、框線圖等文字圖表
+DIAGRAM_PATTERN = re.compile(r'[├└│┌┐┘┬┴┼─►◄▶▼→]')
+SHELL_PATTERN = re.compile(
+    r'^\s*(\$ |flutter |dart |pub |cd |mkdir |git |npm |npx |brew |sudo |export |echo |adb |pod |xcrun |open |ls\b|rm |cp |mv |#!/)'
+)
+DART_PATTERN = re.compile(
+    r"(^\s*import 'package:|^\s*(abstract |final |sealed )?class \w+|@override|\bvoid \w+\(|\bfinal \w+|\bWidget\b|=>|\bFuture<|\basync\b)",
+    re.MULTILINE
+)
+YAML_LINE_PATTERN = re.compile(r'^\s*(- |[\w\-./"\']+:(\s|$))')
+# 保留的判斷結果上限，超過時淘汰最久沒有用到的項目
+MAX_DECISIONS = 4096
+
+
+class CodeLanguageResolver:
+    # 依區塊內容雜湊保存的判斷結果，跨文件與監看模式的多次重建共用（依最近使用排序）
+    _decisions = {}
+
+    @staticmethod
+    def classify(code):
+        """以簡單規則判斷未標註語言的程式碼區塊，無法判斷時回傳 None。"""
+        lines = [line for line in code.split('\n') if line.strip()]
+        if not lines:
+            return None
+
+        stripped = code.strip()
+        if stripped[0] in '{[':
+            try:
+                json.loads(stripped)
+                return 'json'
+            except ValueError:
+                pass
+
+        if DIAGRAM_PATTERN.search(code):
+            return 'text'
+
+        shell_lines = sum(1 for line in lines if SHELL_PATTERN.match(line))
+        if shell_lines and shell_lines >= len(lines) * 0.6:
+            return 'bash'
+
+        if len(DART_PATTERN.findall(code)) >= 2 or (';' in code and DART_PATTERN.search(code)):
+            return 'dart'
+
+        yaml_lines = sum(1 for line in lines if YAML_LINE_PATTERN.match(line))
+        if ';' not in code and yaml_lines >= len(lines) * 0.8 and any(':' in line for line in lines):
+            return 'yaml'
+
+        return None
+
+    @staticmethod
+    def resolve(code, default_language):
+        """判斷區塊語言並依內容雜湊快取結果，最多保留 MAX_DECISIONS 筆。"""
+        decisions = CodeLanguageResolver._decisions
+        key = hashlib.sha1(code.encode('utf-8')).hexdigest()
+        language = decisions.pop(key, None)
+        if language is None:
+            language = CodeLanguageResolver.classify(code) or ''
+            if len(decisions) >= MAX_DECISIONS:
+                del decisions[next(iter(decisions))]
+        decisions[key] = language
+        return language or default_language
+
+    @staticmethod
+    def default_language_for(content_dir):
+        """取得目錄的預設語言，沒有設定時使用 Config.DEFAULT_CODE_LANGUAGE。"""
+        normalized = os.path.normpath(content_dir)
+        for directory, language in Config.CODE_LANGUAGE_DEFAULTS.items():
+            if os.path.normpath(directory) == normalized:
+                return language
+        return Config.DEFAULT_CODE_LANGUAGE
+
+    @staticmethod
+    def annotate_fences(content, default_language):
+        """為沒有語言標籤的程式碼區塊補上語言，避免 codehilite 呼叫 guess_lexer。"""
+        lines = content.split('\n')
+        result = []
+        fence = None
+        opening_index = None
+        block = []
+
+        for line in lines:
+            match = FENCE_PATTERN.match(line)
+            if fence is None:
+                result.append(line)
+                if match:
+                    fence = match.group(2)
+                    opening_index = len(result) - 1 if not match.group(3).strip() else None
+                    block = []
+                continue
+
+            if match and match.group(2)[0] == fence[0] and len(match.group(2)) >= len(fence) \
+                    and not match.group(3).strip():
+                if opening_index is not None:
+                    language = CodeLanguageResolver.resolve('\n'.join(block), default_language)
+                    result[opening_index] = result[opening_index].rstrip() + language
+                fence = None
+            else:
+                block.append(line)
+            result.append(line)
+
+        return '\n'.join(result)
@@ -0,0 +1,92 @@
+from pygments.formatters.html import HtmlFormatter
+from pygments.token import Token
+from utils.config import Config
+
+# 最精簡類別對照：子分類在樣式與上層分類相同時往上合併，最多合併到這些分類（例如 kd、kt → k，s1 → s）
+MINIMAL_TYPES = (
+    Token.Comment,
+    Token.Keyword,
+    Token.Literal.String,
+    Token.Literal.Number,
+    Token.Operator,
+    Token.Punctuation,
+    Token.Generic,
+    Token.Error,
+)
+
+
+class CompactHtmlFormatter(HtmlFormatter):
+    """輸出較精簡 HTML 的 Pygments formatter。
+
+    空白（w）與一般名稱（n）不包 span，直接輸出為文字；同一行中只隔著空白的同類別
+    token 會合併成一個 span。minimal_classes 為 True 時依 style 合併類別：子分類只有在樣式
+    與上層分類相同時才併入上層（最多到 MINIMAL_TYPES），樣式與一般文字相同的 token 不包 span，
+    因此 server 策略內嵌的樣式表顯示結果不變（例如 kc、se、nf 保留各自的顏色）。
+    """
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.minimal_classes = bool(options.get('minimal_classes', False))
+        self._minimal_types = {}
+
+    def minimal_type(self, ttype):
+        """依 style 取得 token 類型合併後的類型，顯示與一般文字相同時回傳 Token.Text。"""
+        if ttype not in self._minimal_types:
+            # 詞法分析器自訂的類型（例如 YAML 的 Literal.Scalar.Plain）沒有樣式，使用最近的上層分類
+            target = ttype
+            while not self.style.styles_token(target):
+                target = target.parent
+            style = self.style.style_for_token(target)
+            while target not in MINIMAL_TYPES and target.parent not in (None, Token) \
+                    and self.style.style_for_token(target.parent) == style:
+                target = target.parent
+            if style == self.style.style_for_token(Token.Text):
+                target = Token.Text
+            self._minimal_types[ttype] = target
+        return self._minimal_types[ttype]
+
+    def compact_type(self, ttype):
+        """將 token 類型轉換為精簡模式使用的類型，不需要 span 的類型回傳 Token.Text。"""
+        if ttype in Token.Text or ttype is Token.Name:
+            return Token.Text
+        if self.minimal_classes:
+            return self.minimal_type(ttype)
+        return ttype
+
+    def compact_tokens(self, tokensource):
+        """轉換 token 類型，並讓同類別 token 之間的空白併入同一個 span。"""
+        previous = Token.Text
+        spaces = []
+        for ttype, value in tokensource:
+            ttype = self.compact_type(ttype)
+            if ttype is Token.Text and value and not value.strip(' \t'):
+                spaces.append(value)
+                continue
+            if spaces:
+                yield (ttype if ttype is previous else Token.Text), ''.join(spaces)
+                spaces = []
+            yield ttype, value
+            previous = Token.Text if '\n' in value else ttype
+        if spaces:
+            yield Token.Text, ''.join(spaces)
+
+    def format_unencoded(self, tokensource, outfile):
+        super().format_unencoded(self.compact_tokens(tokensource), outfile)
+
+
+class CompactHighlight:
+    @staticmethod
+    def extension_configs():
+        """回傳 markdown.markdown 使用的擴充設定（未啟用精簡模式時為空）。
+
+        最精簡類別依 Config.HIGHLIGHT_STYLE 合併，樣式也放進設定中，更換樣式時快取會跟著失效。
+        """
+        if not Config.COMPACT_HIGHLIGHT:
+            return {}
+        return {
+            'codehilite': {
+                'pygments_formatter': CompactHtmlFormatter,
+                'pygments_style': Config.HIGHLIGHT_STYLE,
+                'minimal_classes': Config.MINIMAL_HIGHLIGHT_CLASSES
+            }
+        }
@@ -1,4 +1,54 @@
 class Config:
     CONTENT_DIR = "content"
     OUTPUT_FILE = "flutter-docs.html"
-    SECRET_PASSWORD = "19831203"
\ No newline at end of file
+    SECRET_PASSWORD = "19831203"
+    # secrets 內容的加密格式：aes-gcm（需要 cryptography 套件，前端以 WebCrypto 解密）、chunked 或 legacy
+    ENCRYPTION_FORMAT = "aes-gcm"
+    ENCRYPTION_KDF_ITERATIONS = 200000
+    # 超過此大小的 secrets 改用分塊容器（每個 frame 各自壓縮與加密，前端邊解密邊顯示）
+    ENCRYPTION_CHUNKED_MIN_BYTES = 1024 * 1024
+    ENCRYPTION_FRAME_BYTES = 256 * 1024
+    # 密碼驗證資料：pbkdf2（前端一次原生 PBKDF2 呼叫）或 legacy（5000 次 SHA-256 鏈）
+    PASSWORD_VERIFIER = "pbkdf2"
+    PASSWORD_VERIFIER_ITERATIONS = 100000
+    MARKDOWN_EXTENSIONS = ['codehilite', 'fenced_code']
+    CACHE_DIR = ".render_cache"
+    CACHE_MAX_BYTES = 64 * 1024 * 1024
+    HIGHLIGHT_CACHE_DIR = ".highlight_cache"
+    HIGHLIGHT_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    RENDER_WORKERS = 1
+    SPLIT_MIN_BYTES = 32 * 1024
+    SPLIT_CHUNK_BYTES = 16 * 1024
+    WATCH_INTERVAL = 0.5
+    WATCH_DEBOUNCE = 0.2
+    HIGHLIGHT_STRATEGY = "server"
+    HIGHLIGHT_STYLE = "github-dark"
+    LAZY_TABS = True
+    LAZY_TABS_PREFETCH = True
+    COMPRESS_TABS = False
+    SPLIT_OUTPUT_DIR = "site"
+    VENDOR_DIR = "vendor"
+    VENDOR_PRISM_LANGUAGES = ['dart', 'yaml', 'bash']
+    ICON_SPRITE = True
+    MINIFY_OUTPUT = True
+    PRECOMPRESS = False
+    # 報告中比較的壓縮等級，以及實際寫入 .gz / .br 檔使用的等級
+    PRECOMPRESS_LEVELS = {'gzip': [1, 6, 9], 'br': [5, 9, 11]}
+    PRECOMPRESS_WRITE_LEVEL = {'gzip': 9, 'br': 11}
+    PRECOMPRESS_MIN_BYTES = 1024
+    PURGE_CSS = True
+    # 執行時才組出的類別（例如 alert-${type}、fa-${icon}）與 Bootstrap 在切換元件時加入的類別
+    CSS_PURGE_SAFELIST = [
+        r'^alert-(success|warning|info|danger)$',
+        r'^fa-(check-circle|exclamation-triangle|info-circle|times-circle)$',
+        r'^(show|showing|hiding|fade|collapsing|active|disabled)$',
+    ]
+    # 選擇器中出現這些類別時整條保留（Prism 高亮時才加入的 token 類別）
+    CSS_PURGE_GREEDY_SAFELIST = [r'^token$']
+    LAZY_CODE_BLOCKS = True
+    LAZY_CODE_BLOCKS_MARGIN = "300px"
+    COMPACT_HIGHLIGHT = True
+    MINIMAL_HIGHLIGHT_CLASSES = True
+    RESOLVE_CODE_LANGUAGES = True
+    DEFAULT_CODE_LANGUAGE = "text"
+    CODE_LANGUAGE_DEFAULTS = {}
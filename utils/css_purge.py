@@ -0,0 +1,214 @@
+import re
+from utils.config import Config
+from utils.profiler import BuildProfiler
+from utils.html_template import HTMLTemplate
+
+# 最上層的 <style> 與 <script> 元素；<script> 中（例如 JavaScript 模板字串裡）的 <style> 不是頁面的樣式表
+STYLE_OR_SCRIPT_PATTERN = re.compile(r'<(style|script)\b([^>]*)>(.*?)</\1>', re.DOTALL | re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r'[\w-]+')
+COMMENT_PATTERN = re.compile(r'/\*(?!!).*?\*/', re.DOTALL)
+ATTRIBUTE_SELECTOR_PATTERN = re.compile(r'\[[^\]]*\]')
+NOT_SELECTOR_PATTERN = re.compile(r':not\([^()]*\)')
+SELECTOR_NAME_PATTERN = re.compile(r'[.#]((?:\\.|[\w-])+)')
+CUSTOM_PROPERTY_PATTERN = re.compile(r'(--[\w-]+)\s*:\s*([^;}]*)')
+FONT_FAMILY_PATTERN = re.compile(r'font-family\s*:\s*([^;}]+)')
+# 內容會再往下過濾的群組 at-rule
+GROUP_AT_RULES = ('@media', '@supports', '@layer', '@container')
+
+
+class CssPurger:
+    """移除頁面沒有用到的 CSS 規則。
+
+    掃描輸出的 HTML（含內嵌的 JavaScript 字串）與所有公開文件內容，收集出現過的識別字；
+    選擇器中的 class 與 id 都出現過（或符合 safelist）時保留規則，只有元素、屬性或虛擬類別的選擇器一律保留。
+    規則過濾後，再移除沒有規則引用的 @keyframes 與 @font-face。
+    """
+
+    def __init__(self, used, safelist=None, greedy_safelist=None):
+        self.used = used
+        self.safelist = [re.compile(pattern) for pattern in
+                         (Config.CSS_PURGE_SAFELIST if safelist is None else safelist)]
+        self.greedy_safelist = [re.compile(pattern) for pattern in
+                                (Config.CSS_PURGE_GREEDY_SAFELIST if greedy_safelist is None else greedy_safelist)]
+        self.original_bytes = 0
+        self.purged_bytes = 0
+
+    @staticmethod
+    def used_tokens(html, files_content):
+        """收集 HTML（不含最上層的 <style>）與公開文件內容中出現的識別字。
+
+        壓縮內嵌或分檔輸出的分頁不會以原文出現在 HTML 中，因此另外掃描每份文件掛載時的 HTML。
+        """
+        used = set(TOKEN_PATTERN.findall(CssPurger.map_styles(html, lambda css: '')))
+        for data in files_content.values():
+            if not data.get('is_encrypted'):
+                used.update(TOKEN_PATTERN.findall(HTMLTemplate.fragment_html(data['content'])))
+        return used
+
+    @staticmethod
+    def blocks(css):
+        """依序列出最上層的 (前綴, 區塊內容)；@charset 等敘述與註解的區塊內容為 None。"""
+        position, length = 0, len(css)
+        while position < length:
+            while position < length and css[position].isspace():
+                position += 1
+            if position >= length:
+                break
+            if css.startswith('/*', position):
+                end = css.find('*/', position + 2)
+                end = length if end < 0 else end + 2
+                yield css[position:end], None
+                position = end
+                continue
+
+            index, quote = position, None
+            while index < length:
+                char = css[index]
+                if quote:
+                    if char == '\\':
+                        index += 1
+                    elif char == quote:
+                        quote = None
+                elif char in '"\'':
+                    quote = char
+                elif char in '{;}':
+                    break
+                index += 1
+            if index >= length or css[index] != '{':
+                statement = css[position:index + 1].strip()
+                if statement and statement != '}':
+                    yield statement, None
+                position = index + 1
+                continue
+
+            depth, end, quote = 1, index + 1, None
+            while end < length and depth:
+                char = css[end]
+                if quote:
+                    if char == '\\':
+                        end += 1
+                    elif char == quote:
+                        quote = None
+                elif char in '"\'':
+                    quote = char
+                elif char == '{':
+                    depth += 1
+                elif char == '}':
+                    depth -= 1
+                end += 1
+            yield css[position:index].strip(), css[index + 1:end - 1]
+            position = end
+
+    @staticmethod
+    def rewrite(css, rule):
+        """以 rule(前綴, 區塊內容) 改寫每條規則（回傳空字串表示刪除），群組 at-rule 會遞迴處理。"""
+        output = []
+        for prelude, body in CssPurger.blocks(css):
+            if body is None:
+                output.append(prelude)
+            elif prelude.lower().startswith(GROUP_AT_RULES):
+                inner = CssPurger.rewrite(body, rule)
+                if inner:
+                    output.append(f"{prelude}{{{inner}}}")
+            else:
+                kept = rule(prelude, body)
+                if kept:
+                    output.append(kept)
+        return '\n'.join(output)
+
+    @staticmethod
+    def split_selectors(prelude):
+        """以最上層的逗號切開選擇器清單（略過 :is()、:not() 等括號中的逗號）。"""
+        selectors, depth, start = [], 0, 0
+        for index, char in enumerate(prelude):
+            if char in '([':
+                depth += 1
+            elif char in ')]':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                selectors.append(prelude[start:index].strip())
+                start = index + 1
+        selectors.append(prelude[start:].strip())
+        return [selector for selector in selectors if selector]
+
+    def is_used(self, name):
+        return name in self.used or any(pattern.search(name) for pattern in self.safelist)
+
+    def keep_selector(self, selector):
+        """選擇器中的 class 與 id 都有用到時保留（:not() 與屬性選擇器中的名稱不影響結果）。"""
+        selector = NOT_SELECTOR_PATTERN.sub('', ATTRIBUTE_SELECTOR_PATTERN.sub('', selector))
+        names = [name.replace('\\', '') for name in SELECTOR_NAME_PATTERN.findall(selector)]
+        if any(pattern.search(name) for name in names for pattern in self.greedy_safelist):
+            return True
+        return all(self.is_used(name) for name in names)
+
+    def purge_rules(self, prelude, body):
+        if prelude.startswith('@'):
+            return f"{prelude}{{{body}}}"
+        selectors = [selector for selector in CssPurger.split_selectors(prelude) if self.keep_selector(selector)]
+        if not selectors:
+            return ''
+        return f"{','.join(selectors)}{{{body}}}"
+
+    @staticmethod
+    def referenced_text(css):
+        """保留下來的規則宣告內容，var() 引用的自訂屬性值會一併展開。"""
+        bodies = []
+
+        def collect(prelude, body):
+            if not prelude.lower().startswith(('@font-face', '@keyframes', '@-webkit-keyframes')):
+                bodies.append(body)
+            return ''
+
+        CssPurger.rewrite(css, collect)
+        text = ';\n'.join(bodies)
+        properties = dict(CUSTOM_PROPERTY_PATTERN.findall(text))
+        declarations = CUSTOM_PROPERTY_PATTERN.sub('', text)
+        expanded = [value for name, value in properties.items() if f"var({name}" in declarations]
+        return '\n'.join([declarations, *expanded])
+
+    def purge_css(self, css):
+        """過濾一份樣式表，回傳只含有用規則的 CSS。"""
+        css = CssPurger.rewrite(COMMENT_PATTERN.sub('', css), self.purge_rules)
+        referenced = CssPurger.referenced_text(css)
+
+        def drop_unreferenced(prelude, body):
+            lowered = prelude.lower()
+            if lowered.startswith(('@keyframes', '@-webkit-keyframes')):
+                name = prelude.split(None, 1)[-1].strip()
+                if not re.search(rf'(?<![\w-]){re.escape(name)}(?![\w-])', referenced):
+                    return ''
+            elif lowered.startswith('@font-face'):
+                family = FONT_FAMILY_PATTERN.search(body)
+                if family and family.group(1).strip().strip('"\'') not in referenced:
+                    return ''
+            return f"{prelude}{{{body}}}"
+
+        return CssPurger.rewrite(css, drop_unreferenced)
+
+    @staticmethod
+    def map_styles(html, transform):
+        """以 transform 處理每個最上層 <style> 元素的內容，<script> 的內容原樣保留。"""
+        def replace(match):
+            if match.group(1).lower() != 'style':
+                return match.group(0)
+            return f"<{match.group(1)}{match.group(2)}>{transform(match.group(3))}</{match.group(1)}>"
+
+        return STYLE_OR_SCRIPT_PATTERN.sub(replace, html)
+
+    def purge_html(self, html):
+        """過濾 HTML 中每個最上層的 <style> 區塊。"""
+        def purge(css):
+            purged = self.purge_css(css)
+            self.original_bytes += len(css.encode('utf-8'))
+            self.purged_bytes += len(purged.encode('utf-8'))
+            return purged
+
+        return CssPurger.map_styles(html, purge)
+
+    def report(self):
+        """輸出移除未使用 CSS 節省的位元組。"""
+        saved = self.original_bytes - self.purged_bytes
+        ratio = saved / self.original_bytes * 100 if self.original_bytes else 0.0
+        print(f"🧹 CSS purge: {BuildProfiler.format_bytes(self.original_bytes)} → "
+              f"{BuildProfiler.format_bytes(self.purged_bytes)} (saved {BuildProfiler.format_bytes(saved)}, {ratio:.1f}%)")
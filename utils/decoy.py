@@ -5,8 +5,8 @@ import json
 
 class Decoy:
     @staticmethod
-    def create_decoy_data(real_length=None):
-        """生成更逼真的誘餌數據"""
+    def create_decoy_data(real_length=None, prefix=''):
+        """生成更逼真的誘餌數據（prefix 為真實數據的格式前綴，誘餌使用相同前綴）"""
         decoys = []
         
         # 如果沒有指定長度，使用隨機長度
@@ -27,7 +27,7 @@ class Decoy:
             fake_length = real_length + secrets.randbelow(400) - 200
             fake_length = max(fake_length, 100)  # 確保最小長度
             decoy = decoy_func(fake_length)
-            decoys.append(decoy)
+            decoys.append(prefix + decoy)
         
         return decoys
     
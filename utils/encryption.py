@@ -1,10 +1,168 @@
+import io
 import base64
 import hashlib
 import zlib
 import secrets
 import os
+import math
+from utils.config import Config
+from utils.profiler import BuildProfiler
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:  # cryptography 為選用套件，未安裝時沿用舊版格式
+    AESGCM = None
+
+PAYLOAD_FORMATS = ('aes-gcm', 'chunked', 'legacy')
+# AES-GCM 格式的版本前綴（Base64 不含 ':'，可與舊版格式區分），同時作為 GCM 的附加驗證資料
+AES_GCM_PREFIX = 'v2'
+AES_GCM_SALT_BYTES = 16
+AES_GCM_NONCE_BYTES = 12
+# 分塊容器格式的版本前綴；frame 之間以 Base64 不會出現的 '.' 分隔
+CHUNKED_PREFIX = 'v3'
+CHUNKED_NONCE_PREFIX_BYTES = 8
+CHUNKED_FRAME_SEPARATOR = '.'
+VERIFIER_FORMATS = ('pbkdf2', 'legacy')
+PBKDF2_VERIFIER_PREFIX = 'pbkdf2'
+PBKDF2_VERIFIER_SALT_BYTES = 16
+
+# 各旋轉位數（1-7）的位元組左旋轉對照表
+ROTATE_TABLES = {
+    shift: bytes(((byte << shift) | (byte >> (8 - shift))) & 0xFF for byte in range(256))
+    for shift in range(1, 8)
+}
+# 混淆時每次處理的資料量，讓跨步存取留在 CPU 快取內
+OBFUSCATE_CHUNK_BYTES = 256 * 1024
 
 class Encryption:
+    payload_format = Config.ENCRYPTION_FORMAT
+    verifier_format = Config.PASSWORD_VERIFIER
+
+    @staticmethod
+    def use(payload_format):
+        """切換 secrets 內容的加密格式。"""
+        if payload_format not in PAYLOAD_FORMATS:
+            raise ValueError(f"Unknown payload format: {payload_format} (expected one of {', '.join(PAYLOAD_FORMATS)})")
+        Encryption.payload_format = payload_format
+        return payload_format
+
+    @staticmethod
+    def use_verifier(verifier_format):
+        """切換密碼驗證資料的格式。"""
+        if verifier_format not in VERIFIER_FORMATS:
+            raise ValueError(f"Unknown password verifier: {verifier_format} (expected one of {', '.join(VERIFIER_FORMATS)})")
+        Encryption.verifier_format = verifier_format
+        return verifier_format
+
+    @staticmethod
+    def encrypt_payload(content, password):
+        """以目前的格式加密 secrets 內容；未安裝 cryptography 時改用舊版格式。
+
+        aes-gcm 格式下，大於 Config.ENCRYPTION_CHUNKED_MIN_BYTES 的內容改用分塊容器，前端可以邊解密邊顯示。
+        """
+        if Encryption.payload_format == 'chunked' or (
+                Encryption.payload_format == 'aes-gcm'
+                and len(content.encode('utf-8')) >= Config.ENCRYPTION_CHUNKED_MIN_BYTES):
+            return Encryption.encrypt_chunked(content, password)
+        if Encryption.payload_format == 'aes-gcm':
+            if AESGCM is not None:
+                return Encryption.aes_gcm_encrypt(content, password)
+            print("⚠️ cryptography not installed (pip install cryptography), using the legacy payload format")
+        return Encryption.advanced_encrypt(content, password)
+
+    @staticmethod
+    def derive_key(password, salt, iterations):
+        """以 PBKDF2-HMAC-SHA256 產生 256 位元 AES 金鑰（與 crypto.subtle.deriveKey 相同）。"""
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations, dklen=32)
+
+    @staticmethod
+    def aes_gcm_encrypt(content, password, iterations=None):
+        """AES-256-GCM 格式：v2:<PBKDF2 迭代次數>:<Base64(鹽值 | nonce | 密文與驗證標籤)>
+
+        前端以 crypto.subtle 一次解密，不需要逐位元組的 JavaScript 迴圈。每次加密使用隨機的鹽值與 nonce。
+        """
+        if iterations is None:
+            iterations = Config.ENCRYPTION_KDF_ITERATIONS
+        with BuildProfiler.track('encrypt: compress'):
+            compressed = zlib.compress(content.encode('utf-8'), level=9)
+
+        salt = secrets.token_bytes(AES_GCM_SALT_BYTES)
+        nonce = secrets.token_bytes(AES_GCM_NONCE_BYTES)
+        with BuildProfiler.track('encrypt: key derivation'):
+            key = Encryption.derive_key(password, salt, iterations)
+        with BuildProfiler.track('encrypt: aes-gcm'):
+            ciphertext = AESGCM(key).encrypt(nonce, compressed, AES_GCM_PREFIX.encode())
+        print(f"AES-GCM 加密後長度: {len(ciphertext)}")
+
+        return f"{AES_GCM_PREFIX}:{iterations}:{base64.b64encode(salt + nonce + ciphertext).decode()}"
+
+    @staticmethod
+    def iter_chunked_payload(stream, password, frame_bytes=None, iterations=None):
+        """串流產生分塊容器格式的各段文字，記憶體用量只與 frame 大小有關
+
+        格式：v3:<加密方式>:<PBKDF2 迭代次數>:<Base64 鹽值與 nonce 前綴>:<frame>.<frame>...
+        stream 是二進位檔案物件，每 frame_bytes 位元組的原文各自壓縮、加密並以 Base64 編碼，前端可以逐一解密與解壓縮。
+        AES-GCM 的 nonce 為 nonce 前綴加上 frame 序號，附加驗證資料包含序號與是否為最後一個 frame，
+        重排或截斷 frame 都會驗證失敗；未安裝 cryptography 時每個 frame 改用舊版的 XOR 與混淆。
+        """
+        if frame_bytes is None:
+            frame_bytes = Config.ENCRYPTION_FRAME_BYTES
+        if AESGCM is not None:
+            cipher = 'aes-gcm'
+            iterations = Config.ENCRYPTION_KDF_ITERATIONS if iterations is None else iterations
+            salt = secrets.token_bytes(AES_GCM_SALT_BYTES)
+            nonce_prefix = secrets.token_bytes(CHUNKED_NONCE_PREFIX_BYTES)
+            with BuildProfiler.track('encrypt: key derivation'):
+                aes = AESGCM(Encryption.derive_key(password, salt, iterations))
+            key_material = base64.b64encode(salt + nonce_prefix).decode()
+        else:
+            print("⚠️ cryptography not installed (pip install cryptography), encrypting frames with the legacy cipher")
+            cipher, iterations, key_material = 'legacy', 0, ''
+        yield f"{CHUNKED_PREFIX}:{cipher}:{iterations}:{key_material}:"
+
+        # 多讀一個 frame 才能知道目前的 frame 是否為最後一個
+        frame = stream.read(frame_bytes)
+        index = 0
+        while True:
+            next_frame = stream.read(frame_bytes)
+            final = not next_frame
+            with BuildProfiler.track('encrypt: compress'):
+                compressed = zlib.compress(frame, level=9)
+            if cipher == 'aes-gcm':
+                with BuildProfiler.track('encrypt: aes-gcm'):
+                    nonce = nonce_prefix + index.to_bytes(AES_GCM_NONCE_BYTES - CHUNKED_NONCE_PREFIX_BYTES, 'big')
+                    encrypted = aes.encrypt(nonce, compressed, f"{CHUNKED_PREFIX}:{index}:{int(final)}".encode())
+            else:
+                with BuildProfiler.track('encrypt: obfuscate'):
+                    encrypted = Encryption.enhanced_obfuscate(Encryption.password_xor(compressed, password), password)
+            yield (CHUNKED_FRAME_SEPARATOR if index else '') + base64.b64encode(encrypted).decode()
+            if final:
+                break
+            frame = next_frame
+            index += 1
+
+    @staticmethod
+    def encrypt_chunked(content, password, frame_bytes=None):
+        """以分塊容器格式加密整份內容（建置流程使用）。
+
+        內容已在記憶體中，結果也要整段嵌入 HTML，因此記憶體用量與文件大小成正比；
+        需要限制記憶體時直接以檔案呼叫 iter_chunked_payload。
+        """
+        payload = ''.join(Encryption.iter_chunked_payload(io.BytesIO(content.encode('utf-8')), password, frame_bytes))
+        print(f"分塊容器長度: {len(payload)}（{payload.count(CHUNKED_FRAME_SEPARATOR) + 1} 個 frame）")
+        return payload
+
+    @staticmethod
+    def payload_header(payload):
+        """回傳加密內容的格式前綴（舊版格式為空字串），誘餌數據使用相同前綴。"""
+        for prefix, fields in ((AES_GCM_PREFIX, 2), (CHUNKED_PREFIX, 4)):
+            if payload.startswith(f"{prefix}:"):
+                end = -1
+                for _ in range(fields):
+                    end = payload.index(':', end + 1)
+                return payload[:end + 1]
+        return ''
+
     @staticmethod
     def advanced_encrypt(content, password):
         """
@@ -13,26 +171,24 @@ class Encryption:
         """
         try:
             # 第一層：壓縮（與原版保持一致）
-            compressed = zlib.compress(content.encode('utf-8'), level=9)
+            with BuildProfiler.track('encrypt: compress'):
+                compressed = zlib.compress(content.encode('utf-8'), level=9)
             print(f"壓縮後長度: {len(compressed)}")
             
             # 第二層：密碼 XOR 加密（改進版）
-            password_bytes = password.encode('utf-8')
-            encrypted = bytearray()
-            for i, byte in enumerate(compressed):
-                # 使用更複雜的 XOR 模式
-                key_byte = password_bytes[i % len(password_bytes)]
-                pos_modifier = (i % 256) ^ 0xAA  # 添加位置相關的修飾
-                encrypted.append(byte ^ key_byte ^ pos_modifier)
+            with BuildProfiler.track('encrypt: password xor'):
+                encrypted = Encryption.password_xor(compressed, password)
             
             print(f"XOR 加密後長度: {len(encrypted)}")
             
             # 第三層：混淆（增強版）
-            obfuscated = Encryption.enhanced_obfuscate(bytes(encrypted), password)
+            with BuildProfiler.track('encrypt: obfuscate'):
+                obfuscated = Encryption.enhanced_obfuscate(bytes(encrypted), password)
             print(f"混淆後長度: {len(obfuscated)}")
             
             # 第四層：最終編碼
-            final_result = base64.b64encode(obfuscated).decode()
+            with BuildProfiler.track('encrypt: base64'):
+                final_result = base64.b64encode(obfuscated).decode()
             print(f"最終編碼長度: {len(final_result)}")
             
             return final_result
@@ -41,9 +197,82 @@ class Encryption:
             print(f"加密錯誤: {e}")
             return ""
     
+    @staticmethod
+    def repeat_to_length(pattern, length):
+        """重複 pattern 直到指定長度。"""
+        if not length:
+            return b''
+        return (pattern * (length // len(pattern) + 1))[:length]
+
+    @staticmethod
+    def xor_bytes(data, keystream):
+        """整段資料與等長金鑰串流 XOR（以大整數一次運算，不逐位元組迴圈）。"""
+        length = len(data)
+        return (int.from_bytes(data, 'little') ^ int.from_bytes(keystream, 'little')).to_bytes(length, 'little')
+
+    @staticmethod
+    def rotation_shift(password, i):
+        """第 i 個位元組的左旋轉位數（由位置與密碼字元決定）。"""
+        password_influence = ord(password[i % len(password)]) % 8
+        shift = ((i % 7) + 1 + password_influence) % 8
+        return shift if shift else 1
+
+    @staticmethod
+    def password_xor(data, password):
+        """密碼 XOR 層：金鑰位元組與位置修飾以 lcm(密碼長度, 256) 為週期，先建好一個週期的金鑰串流再整段 XOR。"""
+        password_bytes = password.encode('utf-8')
+        period = math.lcm(len(password_bytes), 256)
+        keystream = bytes(password_bytes[i % len(password_bytes)] ^ (i % 256) ^ 0xAA for i in range(period))
+        return Encryption.xor_bytes(data, Encryption.repeat_to_length(keystream, len(data)))
+
+    @staticmethod
+    def password_xor_bytewise(data, password):
+        """逐位元組的密碼 XOR（原始實作，供效能比較與驗證使用）。"""
+        password_bytes = password.encode('utf-8')
+        encrypted = bytearray()
+        for i, byte in enumerate(data):
+            # 使用更複雜的 XOR 模式
+            key_byte = password_bytes[i % len(password_bytes)]
+            pos_modifier = (i % 256) ^ 0xAA  # 添加位置相關的修飾
+            encrypted.append(byte ^ key_byte ^ pos_modifier)
+        return bytes(encrypted)
+
     @staticmethod
     def enhanced_obfuscate(data, password):
-        """增強的混淆函數"""
+        """增強的混淆函數
+
+        種子 XOR 與位元旋轉都只由位置決定，以 lcm(種子長度, 7, 密碼長度) 為週期：每個位置類別建一張
+        「XOR 後旋轉」的對照表，再以 bytes.translate 一次處理同類別的所有位元組。資料分塊處理讓跨步存取
+        留在 CPU 快取中，結果與逐位元組版本完全相同。
+        """
+        # 生成基於密碼的混淆金鑰
+        obfuscation_seed = hashlib.sha256(f"flutter_secure_{password}_2024".encode()).digest()
+        data = bytes(data)
+
+        # 密碼為空時與逐位元組版本一樣在計算旋轉位數時拋出 ZeroDivisionError
+        period = math.lcm(len(obfuscation_seed), 7, len(password)) or 1
+        xor_tables = {}
+        tables = []
+        for offset in range(min(period, len(data))):
+            seed_byte = obfuscation_seed[offset % len(obfuscation_seed)]
+            if seed_byte not in xor_tables:
+                xor_tables[seed_byte] = bytes(byte ^ seed_byte for byte in range(256))
+            shift = Encryption.rotation_shift(password, offset)
+            tables.append(xor_tables[seed_byte].translate(ROTATE_TABLES[shift]))
+
+        final_result = bytearray(len(data))
+        step = period * max(1, OBFUSCATE_CHUNK_BYTES // period)
+        for start in range(0, len(data), step):
+            chunk = data[start:start + step]
+            end = start + len(chunk)
+            for offset, table in enumerate(tables[:len(chunk)]):
+                final_result[start + offset:end:period] = chunk[offset::period].translate(table)
+
+        return bytes(final_result)
+
+    @staticmethod
+    def enhanced_obfuscate_bytewise(data, password):
+        """逐位元組的混淆（原始實作，供效能比較與驗證使用）。"""
         # 生成基於密碼的混淆金鑰
         obfuscation_seed = hashlib.sha256(f"flutter_secure_{password}_2024".encode()).digest()
         
@@ -66,6 +295,28 @@ class Encryption:
         
         return bytes(final_result)
     
+    @staticmethod
+    def generate_password_verifier(password, iterations=None, salt=None):
+        """以目前的格式生成前端使用的密碼驗證資料
+
+        PBKDF2 格式為 pbkdf2:<迭代次數>:<Base64 鹽值>:<Base64 雜湊>，前端只需呼叫一次 crypto.subtle.deriveBits；
+        legacy 格式為 generate_password_hash 的舊版雜湊。
+        """
+        if Encryption.verifier_format == 'legacy':
+            return Encryption.generate_password_hash(password)
+        return Encryption.pbkdf2_verifier(password, iterations, salt)
+
+    @staticmethod
+    def pbkdf2_verifier(password, iterations=None, salt=None):
+        """生成 PBKDF2-HMAC-SHA256 密碼驗證資料（未指定鹽值時隨機產生）。"""
+        if iterations is None:
+            iterations = Config.PASSWORD_VERIFIER_ITERATIONS
+        if salt is None:
+            salt = secrets.token_bytes(PBKDF2_VERIFIER_SALT_BYTES)
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+        return (f"{PBKDF2_VERIFIER_PREFIX}:{iterations}:"
+                f"{base64.b64encode(salt).decode()}:{base64.b64encode(digest).decode()}")
+
     @staticmethod
     def generate_password_hash(password):
         """生成密碼驗證雜湊"""
@@ -0,0 +1,124 @@
+import json
+from markdown.extensions import Extension
+from markdown.extensions.codehilite import CodeHilite, CodeHiliteExtension
+from markdown.extensions.fenced_code import FencedBlockPreprocessor
+from markdown.preprocessors import Preprocessor
+from utils.render_cache import RenderCache
+
+
+class HighlightCache:
+    # 目前使用中的程式碼區塊快取；為 None 時不快取，直接交給 fenced_code 處理
+    active = None
+
+    @staticmethod
+    def enable(cache_dir, max_bytes):
+        """啟用以 (語言, 程式碼雜湊) 為鍵的高亮結果快取。"""
+        HighlightCache.active = RenderCache(cache_dir, max_bytes, ['codehilite'])
+        return HighlightCache.active
+
+    @staticmethod
+    def disable():
+        """停用高亮結果快取。"""
+        HighlightCache.active = None
+
+    @staticmethod
+    def settings():
+        """回傳目前快取的 (目錄, 大小上限)，未啟用時為 None（供工作程序重新啟用）。"""
+        cache = HighlightCache.active
+        if cache is None:
+            return None
+        return cache.cache_dir, cache.max_bytes
+
+    @staticmethod
+    def extensions():
+        """回傳需要加入 markdown.markdown 的擴充（未啟用快取時為空）。"""
+        if HighlightCache.active is None:
+            return []
+        return [CachedHighlightExtension()]
+
+    @staticmethod
+    def counts():
+        """取得目前程序的命中與未命中次數。"""
+        cache = HighlightCache.active
+        if cache is None:
+            return {'hits': 0, 'misses': 0}
+        return {'hits': cache.hits, 'misses': cache.misses}
+
+    @staticmethod
+    def merge_counts(counts):
+        """將工作程序回報的命中次數合併到主程序。"""
+        cache = HighlightCache.active
+        if cache is None or not counts:
+            return
+        cache.hits += counts['hits']
+        cache.misses += counts['misses']
+
+    @staticmethod
+    def highlight(code, lang, codehilite_config):
+        """以 codehilite 相同的設定高亮程式碼，結果依語言與內容快取。"""
+        cache = HighlightCache.active
+        key = None
+        if cache is not None:
+            key = cache.make_key(json.dumps(
+                [lang, codehilite_config, code], sort_keys=True,
+                default=lambda value: getattr(value, '__qualname__', str(value))
+            ))
+            entry = cache.get(key)
+            if entry is not None:
+                return entry['html']
+
+        local_config = dict(codehilite_config)
+        html = CodeHilite(
+            code,
+            lang=lang,
+            style=local_config.pop('pygments_style', 'default'),
+            **local_config
+        ).hilite(shebang=False)
+
+        if cache is not None:
+            cache.put(key, {'html': html})
+        return html
+
+
+class CachedHighlightPreprocessor(Preprocessor):
+    """在 fenced_code 之前處理一般的程式碼區塊，以快取取代重複的 Pygments 高亮。
+
+    區塊的比對與取代方式與 FencedBlockPreprocessor 相同，輸出完全一致；帶有
+    {attrs} 或 hl_lines 的區塊保留給 fenced_code 處理。
+    """
+
+    def __init__(self, md):
+        super().__init__(md)
+        self.codehilite_config = None
+
+    def run(self, lines):
+        if self.codehilite_config is None:
+            self.codehilite_config = {}
+            for ext in self.md.registeredExtensions:
+                if isinstance(ext, CodeHiliteExtension):
+                    self.codehilite_config = ext.getConfigs()
+        if not self.codehilite_config.get('use_pygments'):
+            return lines
+
+        text = "\n".join(lines)
+        index = 0
+        while True:
+            m = FencedBlockPreprocessor.FENCED_BLOCK_RE.search(text, index)
+            if not m:
+                break
+            if m.group('attrs') or m.group('hl_lines'):
+                index = m.end()
+                continue
+
+            code = HighlightCache.highlight(m.group('code'), m.group('lang') or None, self.codehilite_config)
+            placeholder = self.md.htmlStash.store(code)
+            text = f'{text[:m.start()]}\n{placeholder}\n{text[m.end():]}'
+            index = m.start() + 1 + len(placeholder)
+        return text.split("\n")
+
+
+class CachedHighlightExtension(Extension):
+    def extendMarkdown(self, md):
+        # 優先順序介於 normalize_whitespace (30) 與 fenced_code_block (25) 之間
+        md.registerExtension(self)
+        md.preprocessors.register(CachedHighlightPreprocessor(md), 'cached_highlight', 27)
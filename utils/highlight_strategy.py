@@ -0,0 +1,134 @@
+import re
+from pygments.formatters import HtmlFormatter
+from utils.config import Config
+from utils.compact_highlight import CompactHighlight
+
+STRATEGIES = ('server', 'client-lazy', 'none')
+SPAN_TAG_PATTERN = re.compile(r'</?span[^>]*>')
+SPAN_CLASS_PATTERN = re.compile(r'<span class="([\w-]+)"')
+STYLE_RULE_PATTERN = re.compile(r'^\.codehilite \.([\w-]+) ')
+
+PRISM_STYLESHEET = '<link href="https://cdn.jsdelivr.net/npm/prismjs@1.29.0/themes/prism-tomorrow.css" rel="stylesheet">'
+PRISM_SCRIPTS = '''<script src="https://cdn.jsdelivr.net/npm/prismjs@1.29.0/components/prism-core.min.js"></script>
+    <script src="https://cdn.jsdelivr.net/npm/prismjs@1.29.0/plugins/autoloader/prism-autoloader.min.js"></script>'''
+
+
+class HighlightStrategy:
+    # 目前使用的語法高亮策略：server（建置時以 Pygments 高亮）、client-lazy（瀏覽器以 Prism 逐分頁高亮）、none
+    current = Config.HIGHLIGHT_STRATEGY
+
+    @staticmethod
+    def use(strategy):
+        """切換語法高亮策略。"""
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown highlight strategy: {strategy} (expected one of {', '.join(STRATEGIES)})")
+        HighlightStrategy.current = strategy
+        return strategy
+
+    @staticmethod
+    def extension_configs():
+        """回傳 markdown.markdown 使用的擴充設定；只有 server 策略在建置時執行 Pygments。"""
+        if HighlightStrategy.current == 'server':
+            return CompactHighlight.extension_configs()
+        # 不使用 Pygments 時 codehilite 只輸出 <code class="language-xxx">，交給 Prism 或維持純文字
+        return {'codehilite': {'use_pygments': False}}
+
+    @staticmethod
+    def stylesheet(files_content):
+        """server 策略的 Pygments 樣式表，只保留內容中實際用到的類別。"""
+        if HighlightStrategy.current != 'server':
+            return ''
+        used = set()
+        for data in files_content.values():
+            if not data.get('is_encrypted'):
+                used.update(SPAN_CLASS_PATTERN.findall(data['content']))
+        rules = []
+        for rule in HtmlFormatter(style=Config.HIGHLIGHT_STYLE).get_token_style_defs('.codehilite'):
+            match = STYLE_RULE_PATTERN.match(rule)
+            if match and match.group(1) in used:
+                rules.append(rule.split(' /* ')[0])
+        return '\n        '.join(rules)
+
+    @staticmethod
+    def head_assets():
+        """<head> 中需要的高亮資源。"""
+        if HighlightStrategy.current == 'client-lazy':
+            return PRISM_STYLESHEET
+        return ''
+
+    @staticmethod
+    def body_scripts():
+        """</body> 前需要載入的高亮腳本。"""
+        if HighlightStrategy.current == 'client-lazy':
+            return PRISM_SCRIPTS
+        return ''
+
+    @staticmethod
+    def page_script():
+        """頁面初始化時的高亮程式：client-lazy 只高亮目前顯示的分頁，切換分頁時再高亮新分頁。
+
+        Config.LAZY_CODE_BLOCKS 開啟時改由程式碼區塊的延遲處理逐一高亮，不需要這段程式。
+        """
+        if HighlightStrategy.current != 'client-lazy' or Config.LAZY_CODE_BLOCKS:
+            return ''
+        return '''
+        function highlightPane(pane) {
+            if (typeof Prism === 'undefined' || !pane || pane.dataset.highlighted) return;
+            // 內容尚未掛載的分頁等掛載後再高亮
+            if (pane.querySelector(':scope > .lazy-tab-content, :scope > .compressed-tab-content, :scope > .remote-tab-content')) return;
+            pane.dataset.highlighted = 'true';
+            Prism.highlightAllUnder(pane);
+        }
+
+        document.addEventListener('DOMContentLoaded', function() {
+            highlightPane(document.querySelector('.tab-pane.active'));
+            document.querySelectorAll('a[data-bs-toggle="tab"]').forEach(tabLink => {
+                tabLink.addEventListener('shown.bs.tab', function () {
+                    highlightPane(document.getElementById(tabLink.getAttribute('href').slice(1)));
+                });
+            });
+        });
+        '''
+
+    @staticmethod
+    def element_script(element):
+        """高亮單一 <pre> 區塊的呼叫（程式碼區塊進入可視範圍時執行）。"""
+        if HighlightStrategy.current != 'client-lazy':
+            return ''
+        return f'''const code = {element}.querySelector('code[class*="language-"]');
+            if (code && typeof Prism !== 'undefined') {{
+                Prism.highlightElement(code);
+            }}'''
+
+    @staticmethod
+    def decrypted_script(element):
+        """解密內容顯示後的高亮呼叫。"""
+        if HighlightStrategy.current != 'client-lazy':
+            return ''
+        return f'''// 重新高亮程式碼
+                    if (typeof Prism !== 'undefined') {{
+                        Prism.highlightAllUnder({element});
+                    }}'''
+
+    @staticmethod
+    def report(files_content, html_content):
+        """統計輸出大小、高亮標記所佔位元組與瀏覽器載入時需要高亮的區塊數。"""
+        public = [data for data in sorted(files_content.values(), key=lambda data: data['order'])
+                  if not data.get('is_encrypted')]
+        markup_bytes = sum(
+            len(data['content'].encode('utf-8')) - len(SPAN_TAG_PATTERN.sub('', data['content']).encode('utf-8'))
+            for data in public
+        )
+        code_blocks = sum(data['content'].count('<pre') for data in public)
+        client_blocks = 0
+        if HighlightStrategy.current == 'client-lazy' and public:
+            # 載入時只高亮第一個分頁中有語言標籤的區塊
+            client_blocks = public[0]['content'].count('<code class="language-')
+        return {
+            'strategy': HighlightStrategy.current,
+            'output_bytes': len(html_content.encode('utf-8')),
+            'markup_bytes': markup_bytes,
+            'stylesheet_bytes': len(HighlightStrategy.stylesheet(files_content).encode('utf-8')),
+            'code_blocks': code_blocks,
+            'client_blocks_at_load': client_blocks
+        }
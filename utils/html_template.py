@@ -1,9 +1,20 @@
+import zlib
+import base64
+from utils.config import Config
 from utils.javascript import JavaScriptGenerator
+from utils.profiler import BuildProfiler
+from utils.highlight_strategy import HighlightStrategy
 
 class HTMLTemplate:
     @staticmethod
-    def generate_html_template(files_content, secret_password):
-        """生成完整的 HTML 模板，包含動態內容。"""
+    def generate_html_template(files_content, secret_password, compress_tabs=None, fragments=None):
+        """生成完整的 HTML 模板，包含動態內容。
+
+        compress_tabs 為 True 時，每個公開分頁的 HTML 以 deflate 壓縮後內嵌，開啟分頁時才解壓縮。
+        fragments 為 {分頁 id: 網址} 時不內嵌分頁內容，改在開啟分頁時下載（分檔輸出使用）。
+        """
+        if compress_tabs is None:
+            compress_tabs = Config.COMPRESS_TABS
         sorted_files = sorted(files_content.items(), key=lambda x: x[1]['order'])
         
         nav_items = []
@@ -26,7 +37,7 @@ class HTMLTemplate:
                 continue  # 跳過加密文件，但不增加索引
                 
             # 修正：使用 regular_file_index 來判斷是否為第一個分頁
-            tab_id = filename.replace('.md', '').replace('_', '-').replace(' ', '-').replace('(', '').replace(')', '').lower()
+            tab_id = HTMLTemplate.tab_id(filename)
             active_class = 'active' if regular_file_index == 0 else ''
             
             nav_items.append(f'''
@@ -39,7 +50,39 @@ class HTMLTemplate:
                 </li>
             ''')
             
-            tab_contents.append(f'''
+            if fragments is not None:
+                # 分頁內容放在獨立檔案，開啟分頁時才下載
+                tab_contents.append(f'''
+                <div class="tab-pane fade {'show active' if regular_file_index == 0 else ''}" id="{tab_id}" 
+                     role="tabpanel" aria-labelledby="{tab_id}-tab">
+                    <template class="remote-tab-content" data-src="{fragments[tab_id]}"></template>
+                </div>
+            ''')
+            elif compress_tabs:
+                # 壓縮後以 base64 內嵌在不會執行的 <script> 中，開啟分頁時才解壓縮並掛載
+                payload = base64.b64encode(zlib.compress(
+                    HTMLTemplate.fragment_html(data['content']).encode('utf-8'), 9
+                )).decode('ascii')
+                tab_contents.append(f'''
+                <div class="tab-pane fade {'show active' if regular_file_index == 0 else ''}" id="{tab_id}" 
+                     role="tabpanel" aria-labelledby="{tab_id}-tab">
+                    <script type="text/plain" class="compressed-tab-content">{payload}</script>
+                </div>
+            ''')
+            elif Config.LAZY_TABS and regular_file_index > 0:
+                # 非目前分頁的內容放在 <template> 中，瀏覽器不會解析成 DOM，第一次顯示時才掛載
+                tab_contents.append(f'''
+                <div class="tab-pane fade" id="{tab_id}" 
+                     role="tabpanel" aria-labelledby="{tab_id}-tab">
+                    <template class="lazy-tab-content">
+                    <div class="content-wrapper">
+                        {data['content']}
+                    </div>
+                    </template>
+                </div>
+            ''')
+            else:
+                tab_contents.append(f'''
                 <div class="tab-pane fade {'show active' if regular_file_index == 0 else ''}" id="{tab_id}" 
                      role="tabpanel" aria-labelledby="{tab_id}-tab">
                     <div class="content-wrapper">
@@ -97,9 +140,12 @@ class HTMLTemplate:
         # 修正：只有在有 secrets_data 時才生成 JavaScript
         js_content = ""
         if secrets_data:
-            js_content = JavaScriptGenerator.generate_obfuscated_js(
-                secrets_data['encrypted_content'], secret_password
-            )
+            with BuildProfiler.track('js generation', 'generate_obfuscated_js'):
+                js_content = JavaScriptGenerator.generate_obfuscated_js(
+                    secrets_data['encrypted_content'], secret_password
+                )
+        
+        highlight_styles = HighlightStrategy.stylesheet(files_content)
         
         html_template = f'''<!DOCTYPE html>
 <html lang="zh-TW">
@@ -108,7 +154,7 @@ class HTMLTemplate:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Flutter Development Documentation</title>
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdn.jsdelivr.net/npm/prismjs@1.29.0/themes/prism-tomorrow.css" rel="stylesheet">
+    {HighlightStrategy.head_assets()}
     <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
     <!-- Add pako for decompression -->
     <script src="https://cdnjs.cloudflare.com/ajax/libs/pako/2.1.0/pako.min.js"></script>
@@ -299,6 +345,8 @@ class HTMLTemplate:
             color: #e2e8f0;
         }}
         
+        {highlight_styles}
+        
         .encrypted-content {{
             text-align: center;
             padding: 50px 20px;
@@ -468,63 +516,64 @@ class HTMLTemplate:
     </div>
 
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/prismjs@1.29.0/components/prism-core.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/prismjs@1.29.0/plugins/autoloader/prism-autoloader.min.js"></script>
+    {HighlightStrategy.body_scripts()}
     
     <script>
         // 新增：複製程式碼功能
         function addCopyButtons() {{
-            const preElements = document.querySelectorAll('pre');
-            preElements.forEach((pre, index) => {{
-                // 如果已經有複製按鈕，跳過
-                if (pre.querySelector('.copy-btn')) return;
-                
-                const copyBtn = document.createElement('button');
-                copyBtn.className = 'copy-btn';
-                copyBtn.innerHTML = '<i class="fas fa-copy"></i>';
-                copyBtn.title = 'Copy code';
+            document.querySelectorAll('pre').forEach(addCopyButton);
+        }}
+        
+        function addCopyButton(pre) {{
+            // 如果已經有複製按鈕，跳過
+            if (pre.querySelector('.copy-btn')) return;
+            
+            const copyBtn = document.createElement('button');
+            copyBtn.className = 'copy-btn';
+            copyBtn.innerHTML = '<i class="fas fa-copy"></i>';
+            copyBtn.title = 'Copy code';
+            
+            copyBtn.addEventListener('click', async () => {{
+                const code = pre.querySelector('code') ? pre.querySelector('code').textContent : pre.textContent;
                 
-                copyBtn.addEventListener('click', async () => {{
-                    const code = pre.querySelector('code') ? pre.querySelector('code').textContent : pre.textContent;
+                try {{
+                    await navigator.clipboard.writeText(code);
+                    copyBtn.innerHTML = '<i class="fas fa-check"></i>';
+                    copyBtn.classList.add('copied');
+                    copyBtn.title = 'Copied!';
                     
-                    try {{
-                        await navigator.clipboard.writeText(code);
-                        copyBtn.innerHTML = '<i class="fas fa-check"></i>';
-                        copyBtn.classList.add('copied');
-                        copyBtn.title = 'Copied!';
-                        
-                        setTimeout(() => {{
-                            copyBtn.innerHTML = '<i class="fas fa-copy"></i>';
-                            copyBtn.classList.remove('copied');
-                            copyBtn.title = 'Copy code';
-                        }}, 2000);
-                        
-                        showMessage('程式碼已複製到剪貼簿！', 'success');
-                    }} catch (err) {{
-                        // 使用舊方法作為後備
-                        const textArea = document.createElement('textarea');
-                        textArea.value = code;
-                        document.body.appendChild(textArea);
-                        textArea.select();
-                        document.execCommand('copy');
-                        document.body.removeChild(textArea);
-                        
-                        copyBtn.innerHTML = '<i class="fas fa-check"></i>';
-                        copyBtn.classList.add('copied');
-                        
-                        setTimeout(() => {{
-                            copyBtn.innerHTML = '<i class="fas fa-copy"></i>';
-                            copyBtn.classList.remove('copied');
-                        }}, 2000);
-                        
-                        showMessage('程式碼已複製到剪貼簿！', 'success');
-                    }}
-                }});
-                
-                pre.style.position = 'relative';
-                pre.appendChild(copyBtn);
+                    setTimeout(() => {{
+                        copyBtn.innerHTML = '<i class="fas fa-copy"></i>';
+                        copyBtn.classList.remove('copied');
+                        copyBtn.title = 'Copy code';
+                    }}, 2000);
+                    
+                    showMessage('程式碼已複製到剪貼簿！', 'success');
+                }} catch (err) {{
+                    // 使用舊方法作為後備
+                    const textArea = document.createElement('textarea');
+                    textArea.value = code;
+                    document.body.appendChild(textArea);
+                    textArea.select();
+                    document.execCommand('copy');
+                    document.body.removeChild(textArea);
+                    
+                    copyBtn.innerHTML = '<i class="fas fa-check"></i>';
+                    copyBtn.classList.add('copied');
+                    
+                    setTimeout(() => {{
+                        copyBtn.innerHTML = '<i class="fas fa-copy"></i>';
+                        copyBtn.classList.remove('copied');
+                    }}, 2000);
+                    
+                    showMessage('程式碼已複製到剪貼簿！', 'success');
+                }}
             }});
+            
+            pre.style.position = 'relative';
+            pre.appendChild(copyBtn);
         }}
+        {HTMLTemplate._code_block_runtime()}
         
         // 顯示訊息的輔助函數
         function showMessage(message, type) {{
@@ -565,15 +614,7 @@ class HTMLTemplate:
         
         // 頁面載入完成後添加複製按鈕
         document.addEventListener('DOMContentLoaded', function() {{
-            addCopyButtons();
-            
-            // 監聽 tab 切換，為新內容添加複製按鈕
-            const tabLinks = document.querySelectorAll('a[data-bs-toggle="tab"]');
-            tabLinks.forEach(tabLink => {{
-                tabLink.addEventListener('shown.bs.tab', function () {{
-                    setTimeout(addCopyButtons, 100); // 延遲確保內容已載入
-                }});
-            }});
+            {HTMLTemplate._code_block_init()}
             
             // 為密碼輸入框添加 Enter 鍵支援
             const passwordInputs = document.querySelectorAll('input[type="password"]');
@@ -587,11 +628,9 @@ class HTMLTemplate:
                     }}
                 }});
             }});
-            
-            if (typeof Prism !== 'undefined') {{
-                Prism.highlightAll();
-            }}
         }});
+        {HighlightStrategy.page_script()}
+        {HTMLTemplate._lazy_tab_script(compress_tabs or fragments is not None)}
         
         // 修改右鍵選單事件，只對非程式碼區域禁用
         document.addEventListener('contextmenu', function(e) {{
@@ -634,4 +673,179 @@ class HTMLTemplate:
 </body>
 </html>
 '''
-        return html_template
\ No newline at end of file
+        return html_template
+
+    @staticmethod
+    def tab_id(filename):
+        """由文件名產生分頁 id。"""
+        return filename.replace('.md', '').replace('_', '-').replace(' ', '-').replace('(', '').replace(')', '').lower()
+
+    @staticmethod
+    def fragment_html(content):
+        """分頁內容的 HTML（延後掛載或分檔輸出時使用）。"""
+        return f'<div class="content-wrapper">{content}</div>'
+
+    @staticmethod
+    def _code_block_runtime():
+        """程式碼區塊延遲處理：接近可視範圍時才加上複製按鈕與高亮，並在瀏覽器閒置時分批執行。"""
+        if not Config.LAZY_CODE_BLOCKS:
+            return ''
+        return f'''
+        const pendingCodeBlocks = [];
+        let codeBlockFlushScheduled = false;
+        const scheduleIdle = window.requestIdleCallback
+            ? (callback) => window.requestIdleCallback(callback, {{ timeout: 200 }})
+            : (callback) => setTimeout(() => callback({{ didTimeout: true, timeRemaining: () => 0 }}), 16);
+        
+        function decorateCodeBlock(pre) {{
+            addCopyButton(pre);
+            {HighlightStrategy.element_script('pre')}
+        }}
+        
+        function flushCodeBlocks(deadline) {{
+            // 每次至少處理一個區塊，其餘在閒置時間內盡量處理
+            do {{
+                decorateCodeBlock(pendingCodeBlocks.shift());
+            }} while (pendingCodeBlocks.length && deadline.timeRemaining() > 2);
+            
+            if (pendingCodeBlocks.length) {{
+                scheduleIdle(flushCodeBlocks);
+            }} else {{
+                codeBlockFlushScheduled = false;
+            }}
+        }}
+        
+        function queueCodeBlock(pre) {{
+            pendingCodeBlocks.push(pre);
+            if (!codeBlockFlushScheduled) {{
+                codeBlockFlushScheduled = true;
+                scheduleIdle(flushCodeBlocks);
+            }}
+        }}
+        
+        // 隱藏分頁中的區塊不會進入可視範圍，切換到該分頁時才會處理
+        const codeBlockObserver = 'IntersectionObserver' in window
+            ? new IntersectionObserver((entries, observer) => {{
+                entries.forEach(entry => {{
+                    if (!entry.isIntersecting) return;
+                    observer.unobserve(entry.target);
+                    queueCodeBlock(entry.target);
+                }});
+            }}, {{ rootMargin: '{Config.LAZY_CODE_BLOCKS_MARGIN} 0px' }})
+            : null;
+        
+        function observeCodeBlocks(root) {{
+            root.querySelectorAll('pre').forEach(pre => {{
+                if (codeBlockObserver) {{
+                    codeBlockObserver.observe(pre);
+                }} else {{
+                    queueCodeBlock(pre);
+                }}
+            }});
+        }}
+        '''
+
+    @staticmethod
+    def _code_block_init():
+        """DOMContentLoaded 時的程式碼區塊處理。"""
+        if Config.LAZY_CODE_BLOCKS:
+            return 'observeCodeBlocks(document);'
+        return '''addCopyButtons();
+            
+            // 監聽 tab 切換，為新內容添加複製按鈕
+            const tabLinks = document.querySelectorAll('a[data-bs-toggle="tab"]');
+            tabLinks.forEach(tabLink => {
+                tabLink.addEventListener('shown.bs.tab', function () {
+                    setTimeout(addCopyButtons, 100); // 延遲確保內容已載入
+                });
+            });'''
+
+    @staticmethod
+    def _lazy_tab_script(deferred_tabs):
+        """掛載延後的分頁內容（<template>、壓縮內容或獨立檔案）：分頁顯示前掛載，並可在閒置時預先掛載下一個分頁。"""
+        if not Config.LAZY_TABS and not deferred_tabs:
+            return ''
+        return f'''
+        const DEFERRED_TAB_SELECTOR = ':scope > .lazy-tab-content, :scope > .compressed-tab-content, :scope > .remote-tab-content';
+        const tabHydrations = new Map();
+        
+        async function fetchTabFragment(src) {{
+            const response = await fetch(src);
+            if (!response.ok) {{
+                throw new Error(`${{src}}: HTTP ${{response.status}}`);
+            }}
+            return await response.text();
+        }}
+        
+        async function inflateTabPayload(payload) {{
+            const binary = atob(payload);
+            const bytes = new Uint8Array(binary.length);
+            for (let i = 0; i < binary.length; i++) {{
+                bytes[i] = binary.charCodeAt(i);
+            }}
+            if (typeof DecompressionStream !== 'undefined') {{
+                // 瀏覽器原生解壓縮在背景執行緒進行，不會阻塞主執行緒
+                const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('deflate'));
+                return await new Response(stream).text();
+            }}
+            return pako.inflate(bytes, {{ to: 'string' }});
+        }}
+        
+        function mountTabContent(pane, content) {{
+            if (typeof content === 'string') {{
+                const template = document.createElement('template');
+                template.innerHTML = content;
+                content = template.content;
+            }}
+            pane.replaceChildren(content);
+            if (typeof observeCodeBlocks === 'function') {{
+                observeCodeBlocks(pane);
+            }} else {{
+                addCopyButtons();
+                if (typeof highlightPane === 'function') highlightPane(pane);
+            }}
+        }}
+        
+        function hydrateTab(pane) {{
+            if (!pane) return Promise.resolve();
+            if (tabHydrations.has(pane)) return tabHydrations.get(pane);
+            const deferred = pane.querySelector(DEFERRED_TAB_SELECTOR);
+            if (!deferred) return Promise.resolve();
+            
+            let hydration;
+            if (deferred.classList.contains('remote-tab-content')) {{
+                hydration = fetchTabFragment(deferred.dataset.src).then(html => mountTabContent(pane, html));
+            }} else if (deferred.classList.contains('compressed-tab-content')) {{
+                hydration = inflateTabPayload(deferred.textContent.trim()).then(html => mountTabContent(pane, html));
+            }} else {{
+                hydration = Promise.resolve(mountTabContent(pane, deferred.content));
+            }}
+            tabHydrations.set(pane, hydration.catch(error => {{
+                console.error('分頁內容載入失敗:', error);
+                tabHydrations.delete(pane);
+            }}));
+            return tabHydrations.get(pane);
+        }}
+        
+        function prefetchNextTab(pane) {{
+            if (!{'true' if Config.LAZY_TABS_PREFETCH else 'false'} || !pane) return;
+            const next = pane.nextElementSibling;
+            if (!next || !next.querySelector(DEFERRED_TAB_SELECTOR)) return;
+            const idle = window.requestIdleCallback || ((callback) => setTimeout(callback, 200));
+            idle(() => hydrateTab(next));
+        }}
+        
+        document.addEventListener('DOMContentLoaded', function() {{
+            document.querySelectorAll('a[data-bs-toggle="tab"]').forEach(tabLink => {{
+                // 在 show 階段掛載，淡入動畫開始時內容已經存在（壓縮內容解壓縮完成後才會出現）
+                tabLink.addEventListener('show.bs.tab', function () {{
+                    hydrateTab(document.getElementById(tabLink.getAttribute('href').slice(1)));
+                }});
+                tabLink.addEventListener('shown.bs.tab', function () {{
+                    prefetchNextTab(document.getElementById(tabLink.getAttribute('href').slice(1)));
+                }});
+            }});
+            const activePane = document.querySelector('.tab-pane.active');
+            hydrateTab(activePane).then(() => prefetchNextTab(activePane));
+        }});
+        '''
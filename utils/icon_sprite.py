@@ -0,0 +1,150 @@
+import re
+from utils.profiler import BuildProfiler
+from utils.vendor import AssetVendor
+
+FONT_AWESOME_SVG_BASE = 'https://cdn.jsdelivr.net/npm/@fortawesome/fontawesome-free@6.0.0/svgs'
+FONT_AWESOME_LINK_PATTERN = re.compile(r'\s*<link href="[^"]*font-awesome[^"]*" rel="stylesheet">')
+ICON_MARKUP_PATTERN = re.compile(r'<i class="(?P<classes>[^"]*)"(?P<attrs>[^>]*)></i>')
+# 圖示名稱可以是執行時才組出的模板字串，例如 fa-${type === 'success' ? 'check-circle' : 'times-circle'}
+ICON_CLASS_PATTERN = re.compile(r'(?<![\w-])fa-((?:[a-z0-9-]|\$\{[^}]*\})+)')
+TEMPLATE_LITERAL_PATTERN = re.compile(r"[?:]\s*'([a-z0-9-]+)'")
+SVG_VIEWBOX_PATTERN = re.compile(r'viewBox="([^"]+)"')
+SVG_BODY_PATTERN = re.compile(r'<svg[^>]*>(.*)</svg>', re.DOTALL)
+SVG_COMMENT_PATTERN = re.compile(r'<!--(.*?)-->', re.DOTALL)
+TITLE_ATTRIBUTE_PATTERN = re.compile(r'\s+title="([^"]*)"')
+
+ICON_STYLES = {
+    'fas': 'solid', 'fa-solid': 'solid',
+    'far': 'regular', 'fa-regular': 'regular',
+    'fab': 'brands', 'fa-brands': 'brands',
+}
+# 不是圖示名稱的 fa- 類別（樣式與尺寸修飾）
+ICON_MODIFIERS = {'solid', 'regular', 'brands', 'fw', 'lg', 'sm', 'xs', '2x', '3x', 'spin', 'pulse'}
+# Font Awesome 5 的名稱在 6.0 的 SVG 檔名
+ICON_ALIASES = {
+    'check-circle': 'circle-check',
+    'times-circle': 'circle-xmark',
+    'exclamation-triangle': 'triangle-exclamation',
+    'info-circle': 'circle-info',
+}
+ICON_STYLESHEET = '''<style>
+        .icon {
+            display: inline-block;
+            width: 1.25em;
+            height: 1em;
+            vertical-align: -0.125em;
+            fill: currentColor;
+            overflow: visible;
+        }
+    </style>'''
+
+
+class IconSprite:
+    """以內嵌 SVG sprite 取代 Font Awesome 樣式表與網頁字型。
+
+    收集頁面（HTMLTemplate、JavaScriptGenerator 與工具函式的輸出）中用到的 fa- 圖示，從 vendor 目錄
+    讀取對應的 Font Awesome SVG 組成 <symbol>，並把 <i class="fas fa-xxx"></i> 改寫為 <svg><use>。
+    """
+
+    def __init__(self, vendor_dir):
+        self.vendor = AssetVendor(vendor_dir)
+        self.symbols = {}
+        self.missing = []
+        self.sprite_bytes = 0
+
+    @staticmethod
+    def icon_names(classes):
+        """從 class 屬性取出圖示名稱；模板字串名稱回傳其中所有可能的字面值。"""
+        names = []
+        for name in ICON_CLASS_PATTERN.findall(classes):
+            if name in ICON_MODIFIERS:
+                continue
+            if '${' in name:
+                names.extend(TEMPLATE_LITERAL_PATTERN.findall(name))
+            else:
+                names.append(name)
+        return names
+
+    @staticmethod
+    def icon_style(classes):
+        for name in classes.split():
+            if name in ICON_STYLES:
+                return ICON_STYLES[name]
+        return 'solid'
+
+    @staticmethod
+    def icons(html):
+        """列出頁面用到的圖示，回傳 {名稱: 樣式}。"""
+        icons = {}
+        for match in ICON_MARKUP_PATTERN.finditer(html):
+            classes = match.group('classes')
+            for name in IconSprite.icon_names(classes):
+                icons.setdefault(name, IconSprite.icon_style(classes))
+        return icons
+
+    @staticmethod
+    def svg_url(style, name):
+        return f"{FONT_AWESOME_SVG_BASE}/{style}/{ICON_ALIASES.get(name, name)}.svg"
+
+    def symbol(self, style, name):
+        """讀取 SVG 並轉成 <symbol>，找不到檔案時回傳 None。"""
+        data = self.vendor.read(IconSprite.svg_url(style, name))
+        if data is None:
+            return None
+        svg = data.decode('utf-8')
+        viewbox = SVG_VIEWBOX_PATTERN.search(svg)
+        body = SVG_BODY_PATTERN.search(svg)
+        if not viewbox or not body:
+            return None
+        return f'<symbol id="icon-{name}" viewBox="{viewbox.group(1)}">{SVG_COMMENT_PATTERN.sub("", body.group(1)).strip()}</symbol>'
+
+    def license_comment(self):
+        """保留 Font Awesome SVG 中的授權註解（CC BY 4.0 需標示來源）。"""
+        for style, name in self.symbols:
+            data = self.vendor.read(IconSprite.svg_url(style, name))
+            comment = SVG_COMMENT_PATTERN.search(data.decode('utf-8'))
+            if comment:
+                return f"<!--{comment.group(1)}-->"
+        return ''
+
+    def apply(self, html):
+        """將頁面中的 Font Awesome 圖示改為內嵌 SVG sprite；vendor 目錄中沒有任何 SVG 時維持原樣。"""
+        for name, style in IconSprite.icons(html).items():
+            symbol = self.symbol(style, name)
+            if symbol is None:
+                self.missing.append(f"{style}/{name}")
+            else:
+                self.symbols[(style, name)] = symbol
+        if not self.symbols:
+            return html
+
+        def replace(match):
+            classes = match.group('classes')
+            names = [name for name in ICON_CLASS_PATTERN.findall(classes) if name not in ICON_MODIFIERS]
+            if not names:
+                return match.group(0)
+            # SVG 元素的提示文字需使用 <title> 子元素
+            attrs = match.group('attrs')
+            title = TITLE_ATTRIBUTE_PATTERN.search(attrs)
+            title_element = f"<title>{title.group(1)}</title>" if title else ''
+            return (f'<svg class="{classes} icon" aria-hidden="true"{TITLE_ATTRIBUTE_PATTERN.sub("", attrs)}>'
+                    f'{title_element}<use href="#icon-{names[0]}"></use></svg>')
+
+        html = ICON_MARKUP_PATTERN.sub(replace, html)
+        sprite = (f'<svg xmlns="http://www.w3.org/2000/svg" style="display: none;">{self.license_comment()}'
+                  f'{"".join(self.symbols.values())}</svg>')
+        self.sprite_bytes = len(sprite.encode('utf-8'))
+        html = FONT_AWESOME_LINK_PATTERN.sub('', html, count=1)
+        html = html.replace('</head>', f"    {ICON_STYLESHEET}\n</head>", 1)
+        return html.replace('<body>', f"<body>\n    {sprite}", 1)
+
+    def report(self):
+        """輸出 sprite 大小與找不到 SVG 的圖示。"""
+        if not self.symbols:
+            print(f"⚠️ No Font Awesome SVGs found in {self.vendor.vendor_dir}, keeping the icon font "
+                  f"(run python -m utils.vendor to download them)")
+            return
+        print(f"🎯 Icon sprite: {len(self.symbols)} icon(s), {BuildProfiler.format_bytes(self.sprite_bytes)} "
+              f"(Font Awesome stylesheet and web fonts removed)")
+        for icon in sorted(self.missing):
+            print(f"⚠️ Missing icon SVG, rendering it empty: {icon}")
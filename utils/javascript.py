@@ -2,8 +2,16 @@ import json
 import hashlib
 import secrets
 import random
+from utils.config import Config
 from utils.decoy import Decoy
-from utils.encryption import Encryption
+from utils.encryption import (Encryption, AES_GCM_PREFIX, AES_GCM_SALT_BYTES, AES_GCM_NONCE_BYTES,
+                              CHUNKED_PREFIX, CHUNKED_NONCE_PREFIX_BYTES, CHUNKED_FRAME_SEPARATOR,
+                              PBKDF2_VERIFIER_PREFIX)
+from utils.profiler import BuildProfiler
+from utils.highlight_strategy import HighlightStrategy
+
+# 解密 Worker 每處理這麼多位元組回報一次進度
+DECRYPT_PROGRESS_BYTES = 1024 * 1024
 
 class JavaScriptGenerator:
     @staticmethod
@@ -11,7 +19,10 @@ class JavaScriptGenerator:
         """生成具有永久銷毀功能的混淆 JavaScript"""
         
         # 創建誘餌數據
-        decoys = Decoy.create_decoy_data(len(real_encrypted_content))
+        with BuildProfiler.track('decoy generation', 'create_decoy_data'):
+            decoys = Decoy.create_decoy_data(
+                len(real_encrypted_content), Encryption.payload_header(real_encrypted_content)
+            )
         
         # 隨機插入真實內容
         insert_pos = random.randint(0, len(decoys))
@@ -20,8 +31,8 @@ class JavaScriptGenerator:
         # 生成隨機變數名稱
         var_names = [f"_{secrets.token_hex(6)}" for _ in range(15)]
         
-        # 生成密碼驗證雜湊
-        password_hash = Encryption.generate_password_hash(secret_password)
+        # 生成密碼驗證資料（PBKDF2 或舊版雜湊）
+        password_hash = Encryption.generate_password_verifier(secret_password)
         
         print(f"JavaScript 生成資訊:")
         print(f"- 誘餌數據數量: {len(decoys)}")
@@ -212,135 +223,175 @@ class JavaScriptGenerator:
                         return true;
                     }}
                     
-                    // 雜湊驗證
-                    const hashedInput = await generatePasswordHash(inputPassword);
-                    console.log('輸入密碼雜湊:', hashedInput);
-                    console.log('目標雜湊:', {var_names[2]});
-                    
-                    return hashedInput === {var_names[2]};
+                    return await verifyPasswordHash(inputPassword, {var_names[2]});
                 }} catch (error) {{
                     console.error('密碼驗證錯誤:', error);
                     return false;
                 }}
             }};
             
-            // 密碼雜湊生成函數
-            const generatePasswordHash = async (password) => {{
+            {JavaScriptGenerator._generate_password_functions()}
+            
+            // 解密進度訊息中各階段的名稱
+            const progressLabels = {{
+                decode: '📥 Base64 解碼',
+                deobfuscate: '🔄 反混淆處理',
+                xor: '🔐 密碼解密',
+                decrypt: '🔐 AES-GCM 解密',
+                frames: '📤 分塊解密'
+            }};
+            
+            // 以 Blob URL 建立解密用的 Web Worker；瀏覽器不支援時回傳 null
+            const createDecryptWorker = () => {{
+                if (typeof Worker === 'undefined' || typeof Blob === 'undefined' || typeof URL === 'undefined') {{
+                    return null;
+                }}
                 try {{
-                    const encoder = new TextEncoder();
-                    const salt = encoder.encode("flutter_secure_2024_salt");
-                    let data = new Uint8Array([...encoder.encode(password), ...salt]);
-                    
-                    // 多次雜湊（與 Python 端保持一致）
-                    for (let i = 0; i < 5000; i++) {{
-                        const hashBuffer = await crypto.subtle.digest('SHA-256', data);
-                        data = new Uint8Array(hashBuffer);
-                    }}
-                    
-                    // 轉換為 Base64 並截取前 32 個字符
-                    const hashArray = Array.from(data);
-                    const hashHex = hashArray.map(b => b.toString(16).padStart(2, '0')).join('');
-                    return btoa(hashHex).substring(0, 32);
+                    const source = `(${{secretsDecryptWorker.toString()}})();`;
+                    const url = URL.createObjectURL(new Blob([source], {{ type: 'text/javascript' }}));
+                    return {{ worker: new Worker(url), url }};
                 }} catch (error) {{
-                    console.error('雜湊生成錯誤:', error);
-                    throw error;
+                    console.warn('無法建立解密 Worker，改在主執行緒解密:', error);
+                    return null;
                 }}
             }};
             
-            // 主解密函數
-            const decryptContent = async (tabId, password) => {{
-                try {{
-                    console.log('開始解密過程...');
-                    showMessage('🔓 開始解密處理...', 'info');
-                    
-                    // 獲取加密數據
-                    const encryptedData = {var_names[0]}[{var_names[1]}];
-                    if (!encryptedData || encryptedData === 'DESTROYED_DATA') {{
-                        throw new Error('加密數據已損毀或不存在');
-                    }}
-                    
-                    console.log('加密數據長度:', encryptedData.length);
-                    console.log('加密數據預覽:', encryptedData.substring(0, 50) + '...');
-                    
-                    // Step 1: Base64 解碼
-                    showMessage('📥 執行 Base64 解碼...', 'info');
-                    let decodedData;
-                    try {{
-                        decodedData = Uint8Array.from(atob(encryptedData), c => c.charCodeAt(0));
-                        console.log('Base64 解碼成功，長度:', decodedData.length);
-                    }} catch (e) {{
-                        throw new Error('Base64 解碼失敗: ' + e.message);
+            // 主解密函數：Base64 解碼、解密與解壓縮在 Worker 中執行，解密後的文字交給 onText（分塊容器會逐 frame 呼叫）
+            const decryptContent = (tabId, password, onText) => new Promise((resolve, reject) => {{
+                console.log('開始解密過程...');
+                showMessage('🔓 開始解密處理...', 'info');
+                
+                // 獲取加密數據
+                const encryptedData = {var_names[0]}[{var_names[1]}];
+                if (!encryptedData || encryptedData === 'DESTROYED_DATA') {{
+                    const error = new Error('加密數據已損毀或不存在');
+                    showMessage(`❌ 解密失敗: ${{error.message}}`, 'danger');
+                    reject(error);
+                    return;
+                }}
+                
+                console.log('加密數據長度:', encryptedData.length);
+                console.log('加密數據預覽:', encryptedData.substring(0, 50) + '...');
+                
+                const decoder = new TextDecoder();
+                let handle = null;
+                let received = false;
+                let settled = false;
+                let lastProgress = '';
+                
+                const finish = () => {{
+                    settled = true;
+                    if (handle) {{
+                        handle.worker.terminate();
+                        URL.revokeObjectURL(handle.url);
+                        handle = null;
                     }}
-                    
-                    // Step 2: 反混淆
-                    showMessage('🔄 執行反混淆處理...', 'info');
-                    const deobfuscated = await reverseObfuscation(decodedData, password);
-                    console.log('反混淆完成，長度:', deobfuscated.length);
-                    
-                    // Step 3: 反向 XOR 解密
-                    showMessage('🔐 執行密碼解密...', 'info');
-                    const decrypted = reverseXorEncryption(deobfuscated, password);
-                    console.log('XOR 解密完成，長度:', decrypted.length);
-                    
-                    // Step 4: 解壓縮
-                    showMessage('📤 執行數據解壓縮...', 'info');
-                    const decompressed = pako.inflate(decrypted, {{ to: 'string' }});
-                    console.log('解壓縮成功，內容長度:', decompressed.length);
-                    
-                    showMessage('✅ 解密完成！', 'success');
-                    return decompressed;
-                    
-                }} catch (error) {{
+                }};
+                
+                const fail = (error) => {{
+                    if (settled) return;
+                    finish();
                     console.error('解密錯誤:', error);
                     showMessage(`❌ 解密失敗: ${{error.message}}`, 'danger');
-                    throw error;
+                    reject(error);
+                }};
+                
+                const handleMessage = (message) => {{
+                    if (settled) return;
+                    received = true;
+                    try {{
+                        if (message.type === 'progress') {{
+                            const percent = message.total ? Math.floor(message.done / message.total * 100) : 100;
+                            const text = `${{progressLabels[message.stage] || message.stage}} ${{percent}}%`;
+                            if (text !== lastProgress) {{
+                                lastProgress = text;
+                                showMessage(text, 'info');
+                            }}
+                        }} else if (message.type === 'chunk') {{
+                            // 緩衝區以 transferable 傳回；Worker 無法解壓縮時在主執行緒以 pako 解壓縮
+                            let bytes = new Uint8Array(message.buffer);
+                            if (!message.inflated) {{
+                                bytes = pako.inflate(bytes);
+                            }}
+                            // 多位元組字元可能跨越 frame，以串流模式解碼
+                            onText(decoder.decode(bytes, {{ stream: !message.final }}));
+                        }} else if (message.type === 'done') {{
+                            finish();
+                            showMessage('✅ 解密完成！', 'success');
+                            resolve();
+                        }} else if (message.type === 'error') {{
+                            fail(new Error(message.message));
+                        }}
+                    }} catch (error) {{
+                        fail(error);
+                    }}
+                }};
+                
+                const decryptOnMainThread = () => {{
+                    secretsDecryptWorker()(encryptedData, password, handleMessage)
+                        .catch(error => handleMessage({{ type: 'error', message: error.message || error.name }}));
+                }};
+                
+                handle = createDecryptWorker();
+                if (!handle) {{
+                    decryptOnMainThread();
+                    return;
                 }}
-            }};
+                handle.worker.onmessage = (event) => handleMessage(event.data);
+                handle.worker.onerror = (event) => {{
+                    event.preventDefault();
+                    if (!received) {{
+                        // Worker 無法啟動（例如 CSP 不允許 blob: 腳本）時改在主執行緒解密
+                        console.warn('解密 Worker 啟動失敗，改在主執行緒解密:', event.message);
+                        handle.worker.terminate();
+                        URL.revokeObjectURL(handle.url);
+                        handle = null;
+                        decryptOnMainThread();
+                        return;
+                    }}
+                    fail(new Error(event.message || 'Worker 錯誤'));
+                }};
+                handle.worker.postMessage({{ payload: encryptedData, password }});
+            }});
             
-            // 反混淆函數
-            const reverseObfuscation = async (data, password) => {{
-                try {{
-                    // 生成混淆種子（與 Python 端保持一致）
-                    const seedString = `flutter_secure_${{password}}_2024`;
-                    const seedBuffer = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(seedString));
-                    const obfuscationSeed = new Uint8Array(seedBuffer);
-                    
-                    // 反向位元移位
-                    const step1 = new Uint8Array(data.length);
-                    for (let i = 0; i < data.length; i++) {{
-                        const passwordInfluence = password.charCodeAt(i % password.length) % 8;
-                        let shift = ((i % 7) + 1 + passwordInfluence) % 8;
-                        if (shift === 0) shift = 1;
-                        
-                        const byte = data[i];
-                        step1[i] = ((byte >> shift) | (byte << (8 - shift))) & 0xFF;
+            {JavaScriptGenerator._generate_decrypt_worker()}
+
+            // 逐段顯示解密內容：只在程式碼區塊外的 # / ## 標題前切割，之前的段落先轉為 HTML 顯示
+            const createSectionRenderer = (element) => {{
+                let pending = '';
+                let scanned = 0;
+                let inFence = false;
+                const render = (markdown) => {{
+                    if (element && markdown) {{
+                        element.insertAdjacentHTML('beforeend', markdownToHtml(markdown));
                     }}
-                    
-                    // 反向種子 XOR
-                    const step2 = new Uint8Array(step1.length);
-                    for (let i = 0; i < step1.length; i++) {{
-                        const seedByte = obfuscationSeed[i % obfuscationSeed.length];
-                        step2[i] = step1[i] ^ seedByte;
+                }};
+                return {{
+                    push(text) {{
+                        pending += text;
+                        let cut = 0;
+                        let lineEnd;
+                        while ((lineEnd = pending.indexOf('\\n', scanned)) >= 0) {{
+                            const line = pending.slice(scanned, lineEnd);
+                            if (/^\\s*```/.test(line)) {{
+                                inFence = !inFence;
+                            }} else if (!inFence && scanned > 0 && /^#{{1,2}} /.test(line)) {{
+                                cut = scanned;
+                            }}
+                            scanned = lineEnd + 1;
+                        }}
+                        if (cut > 0) {{
+                            render(pending.slice(0, cut));
+                            pending = pending.slice(cut);
+                            scanned -= cut;
+                        }}
+                    }},
+                    finish() {{
+                        render(pending);
+                        pending = '';
+                        scanned = 0;
                     }}
-                    
-                    return step2;
-                }} catch (error) {{
-                    throw new Error('反混淆失敗: ' + error.message);
-                }}
-            }};
-            
-            // 反向 XOR 解密
-            const reverseXorEncryption = (data, password) => {{
-                const passwordBytes = new TextEncoder().encode(password);
-                const result = new Uint8Array(data.length);
-                
-                for (let i = 0; i < data.length; i++) {{
-                    const keyByte = passwordBytes[i % passwordBytes.length];
-                    const posModifier = (i % 256) ^ 0xAA;
-                    result[i] = data[i] ^ keyByte ^ posModifier;
-                }}
-                
-                return result;
+                }};
             }};
             
             // 主入口函數
@@ -418,26 +469,29 @@ class JavaScriptGenerator:
                     
                     // 解密內容
                     showMessage('✅ 密碼正確，開始解密...', 'success');
-                    const decryptedContent = await decryptContent(tabId, password);
-                    const htmlContent = markdownToHtml(decryptedContent);
-                    
-                    // 顯示解密內容
                     const passwordContainer = document.querySelector('.password-input-container');
-                    if (passwordContainer) {{
-                        passwordContainer.style.display = 'none';
-                    }}
-                    
                     const decryptedDiv = document.getElementById('decrypted-' + tabId);
-                    if (decryptedDiv) {{
-                        decryptedDiv.innerHTML = htmlContent;
-                        decryptedDiv.style.display = 'block';
-                        decryptedDiv.classList.add('success-animation');
-                    }}
+                    const renderer = createSectionRenderer(decryptedDiv);
+                    let shown = false;
+                    await decryptContent(tabId, password, (text) => {{
+                        // 第一段內容解密後就顯示，其餘段落陸續加入
+                        if (!shown) {{
+                            shown = true;
+                            if (passwordContainer) {{
+                                passwordContainer.style.display = 'none';
+                            }}
+                            if (decryptedDiv) {{
+                                decryptedDiv.innerHTML = '';
+                                decryptedDiv.style.display = 'block';
+                                decryptedDiv.classList.add('success-animation');
+                            }}
+                        }}
+                        renderer.push(text);
+                    }});
+                    renderer.finish();
                     
-                    // 重新高亮程式碼
-                    if (typeof Prism !== 'undefined') {{
-                        Prism.highlightAllUnder(decryptedDiv);
-                    }}
+                    {HighlightStrategy.decrypted_script('decryptedDiv')}
+                    {'if (decryptedDiv) observeCodeBlocks(decryptedDiv);' if Config.LAZY_CODE_BLOCKS else ''}
                     
                 }} catch (error) {{
                     console.error('處理錯誤:', error);
@@ -470,6 +524,242 @@ class JavaScriptGenerator:
         '''
         return obfuscated_js
     
+    @staticmethod
+    def _generate_decrypt_worker():
+        """生成解密工作執行緒函數
+        
+        secretsDecryptWorker 以 Blob URL 在 Web Worker 中執行，Base64 解碼、解密與解壓縮都不佔用主執行緒；
+        在主執行緒呼叫時（瀏覽器不支援 Worker）回傳 decryptPayload，以相同的訊息格式回報進度與結果。
+        """
+        return f'''
+            // 解密工作執行緒：訊息為 progress（階段與進度）、chunk（解密後的位元組）、done 與 error
+            function secretsDecryptWorker() {{
+                const progressStep = {DECRYPT_PROGRESS_BYTES};
+                
+                // 分段處理 [0, length)，每段結束後回報進度
+                const eachBlock = (length, progress, process) => {{
+                    for (let start = 0; start < length; start += progressStep) {{
+                        const end = Math.min(start + progressStep, length);
+                        process(start, end);
+                        if (progress) progress(end, length);
+                    }}
+                }};
+                
+                const decodeBase64 = (encoded, progress) => {{
+                    const binary = atob(encoded);
+                    const bytes = new Uint8Array(binary.length);
+                    eachBlock(binary.length, progress, (start, end) => {{
+                        for (let i = start; i < end; i++) {{
+                            bytes[i] = binary.charCodeAt(i);
+                        }}
+                    }});
+                    return bytes;
+                }};
+                
+                // 反混淆：反向位元移位後反向種子 XOR（與 Python 端的 enhanced_obfuscate 相反）
+                const reverseObfuscation = async (data, password, progress) => {{
+                    try {{
+                        // 生成混淆種子（與 Python 端保持一致）
+                        const seedString = `flutter_secure_${{password}}_2024`;
+                        const seedBuffer = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(seedString));
+                        const obfuscationSeed = new Uint8Array(seedBuffer);
+                        
+                        const result = new Uint8Array(data.length);
+                        eachBlock(data.length, progress, (start, end) => {{
+                            for (let i = start; i < end; i++) {{
+                                const passwordInfluence = password.charCodeAt(i % password.length) % 8;
+                                let shift = ((i % 7) + 1 + passwordInfluence) % 8;
+                                if (shift === 0) shift = 1;
+                                
+                                const byte = data[i];
+                                const rotated = ((byte >> shift) | (byte << (8 - shift))) & 0xFF;
+                                result[i] = rotated ^ obfuscationSeed[i % obfuscationSeed.length];
+                            }}
+                        }});
+                        return result;
+                    }} catch (error) {{
+                        throw new Error('反混淆失敗: ' + error.message);
+                    }}
+                }};
+                
+                // 反向 XOR 解密
+                const reverseXorEncryption = (data, password, progress) => {{
+                    const passwordBytes = new TextEncoder().encode(password);
+                    const result = new Uint8Array(data.length);
+                    eachBlock(data.length, progress, (start, end) => {{
+                        for (let i = start; i < end; i++) {{
+                            const keyByte = passwordBytes[i % passwordBytes.length];
+                            const posModifier = (i % 256) ^ 0xAA;
+                            result[i] = data[i] ^ keyByte ^ posModifier;
+                        }}
+                    }});
+                    return result;
+                }};
+                
+                // 以 PBKDF2 從密碼產生 AES-256-GCM 金鑰
+                const deriveAesKey = async (password, salt, iterations) => {{
+                    const baseKey = await crypto.subtle.importKey(
+                        'raw', new TextEncoder().encode(password), 'PBKDF2', false, ['deriveKey']
+                    );
+                    return crypto.subtle.deriveKey(
+                        {{ name: 'PBKDF2', salt, iterations: parseInt(iterations, 10), hash: 'SHA-256' }},
+                        baseKey, {{ name: 'AES-GCM', length: 256 }}, false, ['decrypt']
+                    );
+                }};
+                
+                const decryptAesGcm = async (key, iv, additionalData, data, label) => {{
+                    try {{
+                        return new Uint8Array(await crypto.subtle.decrypt(
+                            {{ name: 'AES-GCM', iv, additionalData: new TextEncoder().encode(additionalData) }}, key, data
+                        ));
+                    }} catch (error) {{
+                        throw new Error(`AES-GCM 解密失敗${{label}}: ` + (error.message || error.name));
+                    }}
+                }};
+                
+                // 解密並解壓縮整份內容，過程中以 post(訊息, transferable) 回報
+                const decryptPayload = async (payload, password, post) => {{
+                    const progress = (stage) => (done, total) => post({{ type: 'progress', stage, done, total }});
+                    
+                    // 解壓縮後以 transferable 傳回；不支援 DecompressionStream 時傳回壓縮資料交給主執行緒
+                    const sendChunk = async (compressed, final) => {{
+                        const inflated = typeof DecompressionStream !== 'undefined';
+                        let bytes = compressed;
+                        if (inflated) {{
+                            const stream = new Blob([compressed]).stream().pipeThrough(new DecompressionStream('deflate'));
+                            bytes = new Uint8Array(await new Response(stream).arrayBuffer());
+                        }} else if (bytes.byteOffset || bytes.byteLength !== bytes.buffer.byteLength) {{
+                            bytes = bytes.slice();
+                        }}
+                        post({{ type: 'chunk', buffer: bytes.buffer, inflated, final }}, [bytes.buffer]);
+                    }};
+                    
+                    if (payload.startsWith('{CHUNKED_PREFIX}:')) {{
+                        // 分塊容器（格式：{CHUNKED_PREFIX}:<加密方式>:<PBKDF2 迭代次數>:<Base64 鹽值與 nonce 前綴>:<frame>{CHUNKED_FRAME_SEPARATOR}<frame>...）
+                        let offset = 0;
+                        for (let i = 0; i < 4; i++) {{
+                            offset = payload.indexOf(':', offset) + 1;
+                        }}
+                        const [, cipher, iterations, keyMaterial] = payload.slice(0, offset - 1).split(':');
+                        const frames = payload.slice(offset).split('{CHUNKED_FRAME_SEPARATOR}');
+                        
+                        let key = null;
+                        let noncePrefix = null;
+                        if (cipher === 'aes-gcm') {{
+                            const material = decodeBase64(keyMaterial);
+                            key = await deriveAesKey(password, material.subarray(0, {AES_GCM_SALT_BYTES}), iterations);
+                            noncePrefix = material.subarray({AES_GCM_SALT_BYTES});
+                        }}
+                        
+                        for (let index = 0; index < frames.length; index++) {{
+                            const final = index === frames.length - 1;
+                            const bytes = decodeBase64(frames[index]);
+                            let compressed;
+                            if (key) {{
+                                // nonce = nonce 前綴 + frame 序號；附加驗證資料包含序號與是否為最後一個 frame
+                                const iv = new Uint8Array({AES_GCM_NONCE_BYTES});
+                                iv.set(noncePrefix);
+                                new DataView(iv.buffer).setUint32({CHUNKED_NONCE_PREFIX_BYTES}, index);
+                                compressed = await decryptAesGcm(
+                                    key, iv, `{CHUNKED_PREFIX}:${{index}}:${{final ? 1 : 0}}`, bytes, `（frame ${{index + 1}}）`
+                                );
+                            }} else {{
+                                compressed = reverseXorEncryption(await reverseObfuscation(bytes, password), password);
+                            }}
+                            await sendChunk(compressed, final);
+                            progress('frames')(index + 1, frames.length);
+                        }}
+                    }} else if (payload.startsWith('{AES_GCM_PREFIX}:')) {{
+                        // AES-256-GCM（格式：{AES_GCM_PREFIX}:<PBKDF2 迭代次數>:<Base64(鹽值 | nonce | 密文與驗證標籤)>）
+                        const [, iterations, encoded] = payload.split(':');
+                        const bytes = decodeBase64(encoded, progress('decode'));
+                        progress('decrypt')(0, 1);
+                        const key = await deriveAesKey(password, bytes.subarray(0, {AES_GCM_SALT_BYTES}), iterations);
+                        const compressed = await decryptAesGcm(
+                            key, bytes.subarray({AES_GCM_SALT_BYTES}, {AES_GCM_SALT_BYTES + AES_GCM_NONCE_BYTES}), '{AES_GCM_PREFIX}',
+                            bytes.subarray({AES_GCM_SALT_BYTES + AES_GCM_NONCE_BYTES}), ''
+                        );
+                        progress('decrypt')(1, 1);
+                        await sendChunk(compressed, true);
+                    }} else {{
+                        // 舊版格式：Base64 解碼、反混淆、反向 XOR
+                        let decodedData;
+                        try {{
+                            decodedData = decodeBase64(payload, progress('decode'));
+                        }} catch (e) {{
+                            throw new Error('Base64 解碼失敗: ' + e.message);
+                        }}
+                        const deobfuscated = await reverseObfuscation(decodedData, password, progress('deobfuscate'));
+                        const decrypted = reverseXorEncryption(deobfuscated, password, progress('xor'));
+                        await sendChunk(decrypted, true);
+                    }}
+                    post({{ type: 'done' }});
+                }};
+                
+                if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {{
+                    self.onmessage = async (event) => {{
+                        try {{
+                            await decryptPayload(
+                                event.data.payload, event.data.password,
+                                (message, transfer) => self.postMessage(message, transfer || [])
+                            );
+                        }} catch (error) {{
+                            self.postMessage({{ type: 'error', message: error.message || error.name }});
+                        }}
+                    }};
+                }}
+                return decryptPayload;
+            }}'''
+
+    @staticmethod
+    def _generate_password_functions():
+        """生成密碼驗證函數（PBKDF2 驗證資料與舊版雜湊）"""
+        return f'''
+            // 比對密碼與驗證資料
+            const verifyPasswordHash = async (password, verifier) => {{
+                if (verifier.startsWith('{PBKDF2_VERIFIER_PREFIX}:')) {{
+                    // PBKDF2：瀏覽器原生實作一次完成所有迭代
+                    const [, iterations, salt, expected] = verifier.split(':');
+                    const encoder = new TextEncoder();
+                    const baseKey = await crypto.subtle.importKey('raw', encoder.encode(password), 'PBKDF2', false, ['deriveBits']);
+                    const bits = await crypto.subtle.deriveBits({{
+                        name: 'PBKDF2',
+                        salt: Uint8Array.from(atob(salt), c => c.charCodeAt(0)),
+                        iterations: parseInt(iterations, 10),
+                        hash: 'SHA-256'
+                    }}, baseKey, 256);
+                    return btoa(String.fromCharCode(...new Uint8Array(bits))) === expected;
+                }}
+                
+                // 舊版雜湊
+                const hashedInput = await generatePasswordHash(password);
+                console.log('輸入密碼雜湊:', hashedInput);
+                console.log('目標雜湊:', verifier);
+                return hashedInput === verifier;
+            }};
+            
+            // 密碼雜湊生成函數（舊版格式）
+            const generatePasswordHash = async (password) => {{
+                try {{
+                    const encoder = new TextEncoder();
+                    const salt = encoder.encode("flutter_secure_2024_salt");
+                    let data = new Uint8Array([...encoder.encode(password), ...salt]);
+                    
+                    // 多次雜湊（與 Python 端保持一致）
+                    for (let i = 0; i < 5000; i++) {{
+                        const hashBuffer = await crypto.subtle.digest('SHA-256', data);
+                        data = new Uint8Array(hashBuffer);
+                    }}
+                    
+                    // 與 Python 端相同：雜湊位元組轉為 Base64 並截取前 32 個字符
+                    return btoa(String.fromCharCode(...data)).substring(0, 32);
+                }} catch (error) {{
+                    console.error('雜湊生成錯誤:', error);
+                    throw error;
+                }}
+            }};
+        '''
+    
     @staticmethod
     def _generate_simple_protection():
         """生成簡化的保護代碼"""
@@ -642,12 +932,6 @@ class JavaScriptGenerator:
                 });
             });
             
-            // 初始化語法高亮
-            if (typeof Prism !== 'undefined') {
-                Prism.highlightAll();
-                console.log('Prism 語法高亮已初始化');
-            }
-            
             // 設置全域函數
             window.showSecrets = showSecrets;
             
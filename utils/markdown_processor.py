@@ -2,7 +2,14 @@ import os
 import re
 import json
 import markdown
+from concurrent.futures import ProcessPoolExecutor
+from utils.config import Config
 from utils.encryption import Encryption
+from utils.markdown_splitter import MarkdownSplitter
+from utils.profiler import BuildProfiler
+from utils.code_language import CodeLanguageResolver
+from utils.highlight_cache import HighlightCache
+from utils.highlight_strategy import HighlightStrategy
 
 
 class MarkdownProcessor:
@@ -23,7 +30,208 @@ class MarkdownProcessor:
         return None
 
     @staticmethod
-    def read_markdown_files(content_dir, secret_password):
+    def title_from_filename(filename):
+        """從文件名推導標題（內容沒有一級標題時使用）。"""
+        return re.sub(r'^\d+\.\s*', '', filename.replace('.md', '').replace('_', ' ')).title()
+
+    @staticmethod
+    def render_markdown(content):
+        """將 Markdown 內容轉換為 HTML（啟用程式碼區塊快取時會重複使用已高亮的區塊）。"""
+        return markdown.markdown(
+            content,
+            extensions=Config.MARKDOWN_EXTENSIONS + HighlightCache.extensions(),
+            extension_configs=HighlightStrategy.extension_configs()
+        )
+
+    @staticmethod
+    def render_document(content, filename=None):
+        """轉換單一文件並擷取標題。"""
+        with BuildProfiler.track('markdown render', filename):
+            html_content = MarkdownProcessor.render_markdown(content)
+        with BuildProfiler.track('title extraction', filename):
+            title = MarkdownProcessor.extract_title_from_content(content)
+        return html_content, title
+
+    @staticmethod
+    def init_worker(highlight_strategy, highlight_cache=None):
+        """工作程序初始化：spawn 啟動的程序（macOS、Windows 預設）不會繼承主程序的類別狀態，
+        需重新套用高亮策略並啟用程式碼區塊快取。"""
+        BuildProfiler.reset_worker()
+        HighlightStrategy.use(highlight_strategy)
+        if highlight_cache is None:
+            HighlightCache.disable()
+        else:
+            HighlightCache.enable(*highlight_cache)
+
+    @staticmethod
+    def render_chunk(chunk, has_next):
+        """轉換文件的其中一個區塊（可在工作程序中執行），一併回傳程式碼區塊快取的命中次數。"""
+        if has_next:
+            chunk = MarkdownSplitter.add_sentinel(chunk)
+        before = HighlightCache.counts()
+        html_chunk = MarkdownProcessor.render_markdown(chunk)
+        after = HighlightCache.counts()
+        return html_chunk, {name: after[name] - before[name] for name in after}
+
+    @staticmethod
+    def split_for_render(content):
+        """大型文件在標題處切成多個區塊，其餘文件維持單一區塊。"""
+        if len(content) < Config.SPLIT_MIN_BYTES:
+            return [content]
+        return MarkdownSplitter.split_into_chunks(content, Config.SPLIT_CHUNK_BYTES)
+
+    @staticmethod
+    def render_documents(documents, cache=None, workers=1):
+        """轉換多個文件，回傳以文件名為鍵的 (HTML, 標題)。
+
+        快取命中的文件直接沿用結果；其餘文件在 workers 大於 1 時切成區塊交由
+        ProcessPoolExecutor 平行轉換，結果依文件名與區塊順序合併，與逐一轉換完全相同。
+        """
+        results = {}
+        pending = []
+        for filename, content in documents:
+            key = None
+            if cache is not None:
+                key = cache.make_key(content)
+                entry = cache.get(key)
+                if entry is not None:
+                    results[filename] = (entry['html'], entry['title'])
+                    continue
+            pending.append((filename, content, key))
+
+        chunks = {}
+        if workers > 1:
+            chunks = {filename: MarkdownProcessor.split_for_render(content) for filename, content, _ in pending}
+
+        if sum(len(parts) for parts in chunks.values()) > 1:
+            tasks = [
+                (filename, index, chunk, index < len(parts) - 1)
+                for filename, parts in chunks.items()
+                for index, chunk in enumerate(parts)
+            ]
+            # 先送出最大的區塊，避免大型區塊最後才開始而拖長總時間
+            tasks.sort(key=lambda task: len(task[2]), reverse=True)
+            with BuildProfiler.track('markdown render (parallel)'), \
+                    ProcessPoolExecutor(max_workers=min(workers, len(tasks)),
+                                        initializer=MarkdownProcessor.init_worker,
+                                        initargs=(HighlightStrategy.current, HighlightCache.settings())) as executor:
+                futures = {
+                    (filename, index): executor.submit(
+                        BuildProfiler.timed, MarkdownProcessor.render_chunk, chunk, has_next
+                    )
+                    for filename, index, chunk, has_next in tasks
+                }
+                rendered = {}
+                for filename, content, _ in pending:
+                    parts = []
+                    for index in range(len(chunks[filename])):
+                        (html_chunk, highlight_counts), timing = futures[(filename, index)].result()
+                        HighlightCache.merge_counts(highlight_counts)
+                        BuildProfiler.record_external(
+                            'markdown render', f"{filename} [{index + 1}/{len(chunks[filename])}]", timing
+                        )
+                        parts.append(html_chunk)
+                    html_content = MarkdownSplitter.stitch(parts)
+                    if html_content is None:
+                        print(f"⚠️ Unable to stitch chunks of {filename}, rendering it as a whole")
+                        html_content = MarkdownProcessor.render_markdown(content)
+                    with BuildProfiler.track('title extraction', filename):
+                        title = MarkdownProcessor.extract_title_from_content(content)
+                    rendered[filename] = (html_content, title)
+        else:
+            rendered = {
+                filename: MarkdownProcessor.render_document(content, filename)
+                for filename, content, _ in pending
+            }
+
+        for filename, _, key in pending:
+            html_content, title = rendered[filename]
+            if cache is not None:
+                cache.put(key, {'html': html_content, 'title': title})
+            results[filename] = (html_content, title)
+
+        return results
+
+    @staticmethod
+    def list_markdown_files(content_dir):
+        """列出目錄中的 Markdown 文件，依文件名順序號排序。"""
+        md_files = [f for f in os.listdir(content_dir) if f.endswith('.md')]
+        md_files.sort(key=lambda x: MarkdownProcessor.extract_order_from_filename(x))
+        return md_files
+
+    @staticmethod
+    def read_documents(content_dir, filenames):
+        """讀取指定的 Markdown 文件，回傳 (文件名, 內容) 清單。"""
+        documents = []
+        for filename in filenames:
+            filepath = os.path.join(content_dir, filename)
+            try:
+                with BuildProfiler.track('file read', filename), open(filepath, 'r', encoding='utf-8') as file:
+                    documents.append((filename, file.read()))
+            except (IOError, UnicodeDecodeError) as e:
+                print(f"❌ Error reading {filename}: {str(e)}")
+                continue
+        return documents
+
+    @staticmethod
+    def resolve_code_languages(documents, default_language):
+        """為未標註語言的程式碼區塊補上語言標籤（secrets 由前端轉換，不做處理）。"""
+        if not Config.RESOLVE_CODE_LANGUAGES:
+            return documents
+        resolved = []
+        for filename, content in documents:
+            if filename != 'secrets.md':
+                with BuildProfiler.track('language resolution', filename):
+                    content = CodeLanguageResolver.annotate_fences(content, default_language)
+            resolved.append((filename, content))
+        return resolved
+
+    @staticmethod
+    def process_documents(documents, secret_password, cache=None, workers=1, default_language=None):
+        """將已讀取的文件轉換為 files_content 項目（一般文件轉 HTML，secrets 加密）。"""
+        files_content = {}
+        if default_language is None:
+            default_language = Config.DEFAULT_CODE_LANGUAGE
+        public_documents = MarkdownProcessor.resolve_code_languages(
+            [(filename, content) for filename, content in documents if filename != 'secrets.md'],
+            default_language
+        )
+        rendered = MarkdownProcessor.render_documents(public_documents, cache, workers)
+
+        for filename, content in documents:
+            if filename == 'secrets.md':
+                # 修正：使用 MarkdownProcessor.extract_title_from_content
+                title = MarkdownProcessor.extract_title_from_content(content)
+                if not title:
+                    title = MarkdownProcessor.title_from_filename(filename)
+                with BuildProfiler.track('encryption', filename):
+                    encrypted_content = Encryption.encrypt_payload(content, secret_password)
+                files_content[filename] = {
+                    'title': '',  # 修正：secrets 檔案的 title 為空
+                    'original_title': title,
+                    'content': content,
+                    'encrypted_content': encrypted_content,
+                    'is_encrypted': True,
+                    'is_hidden': True,
+                    'order': MarkdownProcessor.extract_order_from_filename(filename)  # 修正：加上類別名稱
+                }
+                print(f"🔒 Encrypted secrets content from {filename}")
+                print(json.dumps(files_content[filename], indent=2, ensure_ascii=False))
+            else:
+                html_content, title = rendered[filename]
+                if not title:
+                    title = MarkdownProcessor.title_from_filename(filename)
+                files_content[filename] = {
+                    'title': title,  # 修正：一般檔案的 title 應該是 title 而不是 content
+                    'content': html_content,
+                    'is_encrypted': False,
+                    'order': MarkdownProcessor.extract_order_from_filename(filename)  # 修正：加上類別名稱
+                }
+
+        return files_content
+
+    @staticmethod
+    def read_markdown_files(content_dir, secret_password, cache=None, workers=1):
         """從目錄讀取並處理 Markdown 文件。"""
         files_content = {}
         if not os.path.exists(content_dir):
@@ -31,45 +239,13 @@ class MarkdownProcessor:
             return files_content
 
         try:
-            md_files = [f for f in os.listdir(content_dir) if f.endswith('.md')]
-            md_files.sort(key=lambda x: MarkdownProcessor.extract_order_from_filename(x))
-
-            for filename in md_files:
-                filepath = os.path.join(content_dir, filename)
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as file:
-                        content = file.read()
-                except (IOError, UnicodeDecodeError) as e:
-                    print(f"❌ Error reading {filename}: {str(e)}")
-                    continue
-
-                # 修正：使用 MarkdownProcessor.extract_title_from_content
-                title = MarkdownProcessor.extract_title_from_content(content)
-                if not title:
-                    title = re.sub(r'^\d+\.\s*', '', filename.replace('.md', '').replace('_', ' ')).title()
-
-                if filename == 'secrets.md':
-                    encrypted_content = Encryption.advanced_encrypt(content, secret_password)
-                    files_content[filename] = {
-                        'title': '',  # 修正：secrets 檔案的 title 為空
-                        'original_title': title,
-                        'content': content,
-                        'encrypted_content': encrypted_content,
-                        'is_encrypted': True,
-                        'is_hidden': True,
-                        'order': MarkdownProcessor.extract_order_from_filename(filename)  # 修正：加上類別名稱
-                    }
-                    print(f"🔒 Encrypted secrets content from {filename}")
-                    print(json.dumps(files_content[filename], indent=2, ensure_ascii=False))
-                else:
-                    html_content = markdown.markdown(content, extensions=['codehilite', 'fenced_code'])
-                    files_content[filename] = {
-                        'title': title,  # 修正：一般檔案的 title 應該是 title 而不是 content
-                        'content': html_content,
-                        'is_encrypted': False,
-                        'order': MarkdownProcessor.extract_order_from_filename(filename)  # 修正：加上類別名稱
-                    }
+            md_files = MarkdownProcessor.list_markdown_files(content_dir)
+            documents = MarkdownProcessor.read_documents(content_dir, md_files)
+            files_content = MarkdownProcessor.process_documents(
+                documents, secret_password, cache, workers,
+                CodeLanguageResolver.default_language_for(content_dir)
+            )
         except Exception as e:
             print(f"❌ Error processing directory {content_dir}: {str(e)}")
 
-        return files_content
\ No newline at end of file
+        return files_content
@@ -0,0 +1,84 @@
+import re
+
+# 只在程式碼區塊外的一級、二級標題切割
+HEADING_PATTERN = re.compile(r'^#{1,2}(?!#)\s')
+FENCE_PATTERN = re.compile(r'^\s*(`{3,}|~{3,})')
+# 參考式連結、註腳等會跨越整份文件生效，出現時不切割
+DOCUMENT_WIDE_PATTERN = re.compile(r'^\s{0,3}\[[^\]]+\]:', re.MULTILINE)
+# 附加在非最後區塊結尾的標記段落，用來保留區塊之間原本的空白
+SENTINEL = 'mdsplitsentinel0x7f3a9c'
+SENTINEL_HTML = f'<p>{SENTINEL}</p>'
+
+
+class MarkdownSplitter:
+    @staticmethod
+    def split_sections(content):
+        """在程式碼區塊外的 #/## 標題處切割 Markdown，回傳各段落原文。"""
+        sections = []
+        current = []
+        fence = None
+
+        for line in content.split('\n'):
+            fence_match = FENCE_PATTERN.match(line)
+            if fence is None:
+                if fence_match:
+                    fence = fence_match.group(1)
+                elif HEADING_PATTERN.match(line) and current:
+                    sections.append('\n'.join(current))
+                    current = []
+            elif fence_match and fence_match.group(1)[0] == fence[0] and len(fence_match.group(1)) >= len(fence):
+                # 結束標記需與開始標記同字元且長度不短於開始標記
+                fence = None
+            current.append(line)
+
+        if current:
+            sections.append('\n'.join(current))
+        return sections
+
+    @staticmethod
+    def split_into_chunks(content, min_chunk_bytes):
+        """將段落合併成至少 min_chunk_bytes 的區塊；無法安全切割時回傳整份文件。"""
+        if DOCUMENT_WIDE_PATTERN.search(content) or SENTINEL in content:
+            return [content]
+
+        chunks = []
+        current = []
+        current_size = 0
+        for section in MarkdownSplitter.split_sections(content):
+            current.append(section)
+            current_size += len(section)
+            if current_size >= min_chunk_bytes:
+                chunks.append('\n'.join(current))
+                current = []
+                current_size = 0
+
+        if current:
+            if chunks and current_size < min_chunk_bytes // 2:
+                # 過小的尾段併入前一個區塊
+                chunks[-1] = chunks[-1] + '\n' + '\n'.join(current)
+            else:
+                chunks.append('\n'.join(current))
+
+        return [chunk for chunk in chunks if chunk.strip()] or [content]
+
+    @staticmethod
+    def add_sentinel(chunk):
+        """在區塊結尾附加標記段落。
+
+        markdown.markdown 會去除輸出結尾的空白，但整份轉換時區塊之間可能是一個或
+        兩個換行（例如程式碼區塊之後），附加標記可保留原本的間隔。
+        """
+        return f"{chunk}\n\n{SENTINEL}"
+
+    @staticmethod
+    def stitch(rendered_chunks):
+        """將各區塊轉換後的 HTML 依序接回完整文件，標記異常時回傳 None。"""
+        parts = []
+        for index, html in enumerate(rendered_chunks):
+            if index == len(rendered_chunks) - 1:
+                parts.append(html)
+                continue
+            if not html.endswith(SENTINEL_HTML):
+                return None
+            parts.append(html[:-len(SENTINEL_HTML)])
+        return ''.join(parts)
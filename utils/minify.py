@@ -0,0 +1,230 @@
+import re
+from utils.profiler import BuildProfiler
+
+# <pre>/<textarea> 內容原樣保留，<script>/<style> 另外以 JS/CSS 規則處理
+PROTECTED_PATTERN = re.compile(r'<(pre|textarea|script|style)\b([^>]*)>(.*?)</\1>', re.DOTALL | re.IGNORECASE)
+SCRIPT_TYPE_PATTERN = re.compile(r'\btype="([^"]*)"')
+HTML_COMMENT_PATTERN = re.compile(r'<!--(?![!\[]).*?-->', re.DOTALL)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# 前後空白不影響排版的區塊元素
+BLOCK_TAG_PATTERN = re.compile(
+    r'\s*(</?(?:html|head|body|meta|link|title|div|p|ul|ol|li|h[1-6]|table|thead|tbody|tfoot|tr|td|th|nav|'
+    r'header|footer|section|article|main|blockquote|hr|br|template|form|dl|dt|dd|symbol|!DOCTYPE)\b[^>]*>)\s*',
+    re.IGNORECASE
+)
+CSS_TOKEN_PATTERN = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'|/\*.*?\*/)', re.DOTALL)
+CSS_PUNCTUATION_PATTERN = re.compile(r'\s*([{};,>])\s*')
+JS_SCRIPT_TYPES = ('', 'text/javascript', 'module', 'application/javascript')
+# 這些字元之後的換行可以省略而不影響自動分號插入
+JS_NEWLINE_SAFE_BEFORE = set('{;,([=:&|?*<>!%^~')
+JS_NEWLINE_SAFE_AFTER = set('}),;.?:]')
+# 出現在這些關鍵字之後的 / 是正規表示式的開頭
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw',
+                     'instanceof', 'yield', 'await'}
+
+
+class Minifier:
+    """輸出前壓縮 HTML、內嵌 CSS 與 JavaScript。
+
+    只做不改變語意的處理：移除註解（保留 /*! 與 <!--! 授權註解）與多餘空白；<pre>、<textarea>
+    與字串、模板字串、正規表示式的內容保持不變；JavaScript 中可能影響自動分號插入的換行會保留。
+    """
+
+    def __init__(self):
+        self.original = {'html': 0, 'css': 0, 'js': 0}
+        self.minified = {'html': 0, 'css': 0, 'js': 0}
+
+    @staticmethod
+    def minify_css(css):
+        """移除 CSS 註解與多餘空白。"""
+        output = []
+        for index, part in enumerate(CSS_TOKEN_PATTERN.split(css)):
+            if index % 2:
+                if part.startswith('/*') and not part.startswith('/*!'):
+                    continue
+                output.append(part)
+                continue
+            part = WHITESPACE_PATTERN.sub(' ', part)
+            part = CSS_PUNCTUATION_PATTERN.sub(r'\1', part)
+            output.append(part.replace(': ', ':'))
+        return ''.join(output).replace(';}', '}').strip()
+
+    @staticmethod
+    def skip_string(code, index):
+        """回傳從 index 開始的字串結尾位置（index 指向引號）。"""
+        quote, index = code[index], index + 1
+        while index < len(code) and code[index] != quote:
+            index += 2 if code[index] == '\\' else 1
+        return index + 1
+
+    @staticmethod
+    def skip_template(code, index):
+        """回傳從 index 開始的模板字串結尾位置，${...} 中的巢狀字串與大括號一併略過。"""
+        index += 1
+        while index < len(code) and code[index] != '`':
+            if code[index] == '\\':
+                index += 2
+            elif code.startswith('${', index):
+                index += 2
+                depth = 1
+                while index < len(code) and depth:
+                    char = code[index]
+                    if char in '"\'':
+                        index = Minifier.skip_string(code, index)
+                        continue
+                    if char == '`':
+                        index = Minifier.skip_template(code, index)
+                        continue
+                    depth += {'{': 1, '}': -1}.get(char, 0)
+                    index += 1
+            else:
+                index += 1
+        return index + 1
+
+    @staticmethod
+    def skip_regex(code, index):
+        """回傳從 index 開始的正規表示式結尾位置（含旗標）。"""
+        index += 1
+        in_class = False
+        while index < len(code):
+            char = code[index]
+            if char == '\\':
+                index += 2
+                continue
+            if char == '[':
+                in_class = True
+            elif char == ']':
+                in_class = False
+            elif char == '/' and not in_class:
+                break
+            elif char == '\n':
+                break
+            index += 1
+        index += 1
+        while index < len(code) and (code[index].isalnum() or code[index] == '_'):
+            index += 1
+        return index
+
+    @staticmethod
+    def is_word(char):
+        return char.isalnum() or char in '_$'
+
+    @staticmethod
+    def minify_js(code):
+        """移除 JavaScript 註解與多餘空白。"""
+        output = []
+        pending = ''
+        previous = ''
+        index, length = 0, len(code)
+
+        def emit(token, kind):
+            nonlocal pending, previous
+            if pending and output:
+                before, after = output[-1][-1], token[0]
+                if pending == '\n':
+                    if before not in JS_NEWLINE_SAFE_BEFORE and after not in JS_NEWLINE_SAFE_AFTER:
+                        output.append('\n')
+                elif ((Minifier.is_word(before) and Minifier.is_word(after))
+                      or (before in '+-' and after == before)
+                      or (before.isdigit() and after == '.')
+                      or (previous == 'regex' and Minifier.is_word(after))):
+                    output.append(' ')
+            output.append(token)
+            pending = ''
+            previous = kind
+
+        while index < length:
+            char = code[index]
+            if char.isspace():
+                end = index
+                while end < length and code[end].isspace():
+                    end += 1
+                pending = '\n' if '\n' in code[index:end] or pending == '\n' else ' '
+                index = end
+            elif code.startswith('//', index):
+                end = code.find('\n', index)
+                index = length if end < 0 else end
+            elif code.startswith('/*', index):
+                end = code.find('*/', index + 2)
+                end = length if end < 0 else end + 2
+                if code.startswith('/*!', index):
+                    emit(code[index:end], 'comment')
+                else:
+                    pending = '\n' if '\n' in code[index:end] or pending == '\n' else (pending or ' ')
+                index = end
+            elif char in '"\'':
+                end = Minifier.skip_string(code, index)
+                emit(code[index:end], 'string')
+                index = end
+            elif char == '`':
+                end = Minifier.skip_template(code, index)
+                emit(code[index:end], 'string')
+                index = end
+            elif char == '/' and (not output or previous == 'keyword' or
+                                  (previous == 'punctuation' and output[-1] not in ')]}')):
+                end = Minifier.skip_regex(code, index)
+                emit(code[index:end], 'regex')
+                index = end
+            elif Minifier.is_word(char):
+                end = index
+                while end < length and Minifier.is_word(code[end]):
+                    end += 1
+                word = code[index:end]
+                emit(word, 'keyword' if word in JS_REGEX_KEYWORDS else 'word')
+                index = end
+            else:
+                emit(char, 'punctuation')
+                index += 1
+        return ''.join(output)
+
+    @staticmethod
+    def minify_markup(html):
+        """壓縮不含 <pre>/<script>/<style> 的 HTML 片段。"""
+        html = HTML_COMMENT_PATTERN.sub('', html)
+        html = WHITESPACE_PATTERN.sub(' ', html)
+        return BLOCK_TAG_PATTERN.sub(r'\1', html)
+
+    def record(self, kind, original, minified):
+        self.original[kind] += len(original.encode('utf-8'))
+        self.minified[kind] += len(minified.encode('utf-8'))
+
+    def minify_html(self, html):
+        """壓縮整份 HTML，內嵌的 <style> 與 <script> 分別以 CSS 與 JavaScript 規則處理。"""
+        output = []
+        position = 0
+        for match in PROTECTED_PATTERN.finditer(html):
+            markup = Minifier.minify_markup(html[position:match.start()])
+            self.record('html', html[position:match.start()], markup)
+            output.append(markup.rstrip() if match.group(1).lower() != 'textarea' else markup)
+
+            tag, attributes, content = match.group(1).lower(), match.group(2), match.group(3)
+            minified = content
+            if tag == 'style':
+                minified = Minifier.minify_css(content)
+                self.record('css', content, minified)
+            elif tag == 'script':
+                script_type = SCRIPT_TYPE_PATTERN.search(attributes)
+                if (script_type.group(1) if script_type else '') in JS_SCRIPT_TYPES:
+                    minified = Minifier.minify_js(content)
+                    self.record('js', content, minified)
+            if minified is content:
+                self.record('html', content, content)
+            output.append(f"<{match.group(1)}{attributes}>{minified}</{match.group(1)}>")
+            position = match.end()
+
+        markup = Minifier.minify_markup(html[position:])
+        self.record('html', html[position:], markup)
+        output.append(markup)
+        return ''.join(output).strip()
+
+    def report(self):
+        """輸出壓縮前後的大小與各類內容節省的位元組。"""
+        original, minified = sum(self.original.values()), sum(self.minified.values())
+        saved = original - minified
+        ratio = saved / original * 100 if original else 0.0
+        details = ', '.join(
+            f"{kind.upper()} -{BuildProfiler.format_bytes(self.original[kind] - self.minified[kind])}"
+            for kind in ('html', 'css', 'js')
+        )
+        print(f"🗜️ Minify: {BuildProfiler.format_bytes(original)} → {BuildProfiler.format_bytes(minified)} "
+              f"(saved {BuildProfiler.format_bytes(saved)}, {ratio:.1f}%; {details})")
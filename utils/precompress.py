@@ -0,0 +1,111 @@
+import os
+import gzip
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.config import Config
+from utils.profiler import BuildProfiler
+
+try:
+    import brotli
+except ImportError:  # Brotli 為選用套件，未安裝時只輸出 .gz
+    brotli = None
+
+SIDECAR_EXTENSIONS = ('.gz', '.br')
+
+
+class Precompressor:
+    """在輸出檔旁寫入預先壓縮的 .gz / .br 檔，讓靜態伺服器直接回傳而不必每次即時壓縮。
+
+    每個檔案以 Config.PRECOMPRESS_LEVELS 中的每個等級壓縮並記錄大小與耗時，
+    寫入的是 Config.PRECOMPRESS_WRITE_LEVEL 指定等級的結果。多個檔案時以執行緒平行壓縮
+    （zlib 與 Brotli 壓縮時會釋放 GIL）。
+    """
+
+    def __init__(self, workers=1):
+        self.workers = max(1, workers)
+        self.formats = {'gzip': '.gz'}
+        if brotli is not None:
+            self.formats['br'] = '.br'
+        # (格式, 等級) -> [原始位元組, 壓縮後位元組, 耗時]
+        self.results = {}
+        self.written = 0
+        self.unchanged = 0
+        self.elapsed = 0.0
+
+    @staticmethod
+    def compress(data, format_name, level):
+        if format_name == 'gzip':
+            # 固定 mtime，內容相同時 .gz 檔也完全相同
+            return gzip.compress(data, compresslevel=level, mtime=0)
+        return brotli.compress(data, quality=level)
+
+    @staticmethod
+    def compress_file(path, format_name, extension, levels, write_level):
+        """以各等級壓縮單一檔案並寫入指定等級的結果，回傳各等級的 (大小, 耗時)。"""
+        with open(path, 'rb') as file:
+            data = file.read()
+        results = {}
+        for level in levels:
+            start = time.perf_counter()
+            compressed = Precompressor.compress(data, format_name, level)
+            results[level] = (len(compressed), time.perf_counter() - start)
+            if level == write_level:
+                output = compressed
+        sidecar = f"{path}{extension}"
+        if len(output) < len(data):
+            tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as file:
+                file.write(output)
+            os.replace(tmp_path, sidecar)
+        elif os.path.exists(sidecar):
+            # 壓縮後沒有比較小就不提供壓縮版本
+            os.remove(sidecar)
+        return len(data), results
+
+    @staticmethod
+    def is_current(path, extension):
+        """壓縮檔已存在且比原始檔新時不需重新壓縮（內容雜湊命名的檔案不會改變）。"""
+        sidecar = f"{path}{extension}"
+        return os.path.exists(sidecar) and os.path.getmtime(sidecar) >= os.path.getmtime(path)
+
+    def run(self, paths):
+        """壓縮所有檔案（小於 Config.PRECOMPRESS_MIN_BYTES 的檔案略過）。"""
+        tasks = []
+        for path in paths:
+            if not os.path.exists(path) or os.path.getsize(path) < Config.PRECOMPRESS_MIN_BYTES:
+                continue
+            for format_name, extension in self.formats.items():
+                if self.is_current(path, extension):
+                    self.unchanged += 1
+                    continue
+                write_level = Config.PRECOMPRESS_WRITE_LEVEL[format_name]
+                levels = sorted(set(Config.PRECOMPRESS_LEVELS[format_name]) | {write_level})
+                tasks.append((path, format_name, extension, levels, write_level))
+
+        start = time.perf_counter()
+        with BuildProfiler.track('precompress'), \
+                ThreadPoolExecutor(max_workers=min(self.workers, max(1, len(tasks)))) as executor:
+            futures = [(task[1], executor.submit(Precompressor.compress_file, *task)) for task in tasks]
+            for format_name, future in futures:
+                original_size, results = future.result()
+                self.written += 1
+                for level, (size, seconds) in results.items():
+                    totals = self.results.setdefault((format_name, level), [0, 0, 0.0])
+                    totals[0] += original_size
+                    totals[1] += size
+                    totals[2] += seconds
+        self.elapsed = time.perf_counter() - start
+        return self
+
+    def report(self):
+        """輸出各格式與等級的壓縮率與耗時。"""
+        formats = ', '.join(f"{extension}" for extension in self.formats.values())
+        print(f"🗜️ Precompressed {self.written} file(s) ({formats}) in {self.elapsed:.2f}s, "
+              f"{self.unchanged} already up to date")
+        if brotli is None:
+            print("   Brotli not installed (pip install brotli), writing .gz only")
+        for (format_name, level), (original, compressed, seconds) in sorted(self.results.items()):
+            ratio = compressed / original * 100 if original else 0.0
+            marker = ' ← written' if level == Config.PRECOMPRESS_WRITE_LEVEL[format_name] else ''
+            print(f"   {format_name:<4} level {level:>2}: {BuildProfiler.format_bytes(original)} → "
+                  f"{BuildProfiler.format_bytes(compressed)} ({ratio:.1f}%), {seconds:.3f}s{marker}")
@@ -0,0 +1,237 @@
+import os
+import json
+import time
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class BuildProfiler:
+    # 目前啟用中的分析器；為 None 時所有量測都不做任何事
+    current = None
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._stack = []
+        self.origin = time.perf_counter()
+
+    def start(self):
+        """啟用分析器並開始追蹤記憶體配置。"""
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.origin = time.perf_counter()
+        BuildProfiler.current = self
+        return self
+
+    def stop(self):
+        """停用分析器。"""
+        if BuildProfiler.current is self:
+            BuildProfiler.current = None
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    def reset_worker():
+        """工作程序初始化：fork 時繼承的分析器與記憶體追蹤不適用於子程序。"""
+        BuildProfiler.current = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    def track(stage, item=None):
+        """量測一個建置階段；沒有啟用分析器時回傳空的 context manager。"""
+        profiler = BuildProfiler.current
+        if profiler is None:
+            return nullcontext()
+        return profiler.measure(stage, item)
+
+    def _memory_peak(self):
+        """讀取並重設 tracemalloc 峰值，回傳重設前的峰值。"""
+        if not self.trace_memory or not tracemalloc.is_tracing():
+            return 0
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        return peak
+
+    @contextmanager
+    def measure(self, stage, item=None):
+        """記錄階段的實際時間、CPU 時間與記憶體峰值。
+
+        巢狀階段會重設 tracemalloc 峰值，因此每一層都保存自己看過的最大峰值，
+        離開內層時再回報給外層，外層的峰值仍然正確。
+        """
+        peak = self._memory_peak()
+        if self._stack:
+            self._stack[-1]['peak'] = max(self._stack[-1]['peak'], peak)
+        current = tracemalloc.get_traced_memory()[0] if self.trace_memory and tracemalloc.is_tracing() else 0
+        frame = {'peak': current, 'start_memory': current}
+        # 進入時就加入記錄，使記錄依開始順序排列（外層階段排在內層之前）
+        record = {
+            'stage': stage,
+            'item': item,
+            'depth': len(self._stack),
+            'pid': os.getpid(),
+            'tid': threading.get_ident()
+        }
+        self.records.append(record)
+        self._stack.append(frame)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        record['start_seconds'] = wall_start - self.origin
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            frame['peak'] = max(frame['peak'], self._memory_peak())
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]['peak'] = max(self._stack[-1]['peak'], frame['peak'])
+            record.update({
+                'wall_seconds': wall,
+                'cpu_seconds': cpu,
+                'peak_memory_bytes': max(frame['peak'] - frame['start_memory'], 0)
+            })
+
+    @staticmethod
+    def timed(function, *args):
+        """執行函式並回傳 (結果, 計時資訊)，供工作程序回報給主程序的分析器。"""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        result = function(*args)
+        return result, {
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'start': wall_start,
+            'wall_seconds': time.perf_counter() - wall_start,
+            'cpu_seconds': time.process_time() - cpu_start
+        }
+
+    @staticmethod
+    def record_external(stage, item, timing):
+        """記錄在其他程序中量測的階段（例如平行轉換的工作程序）。"""
+        profiler = BuildProfiler.current
+        if profiler is None:
+            return
+        profiler.records.append({
+            'stage': stage,
+            'item': item,
+            'depth': len(profiler._stack),
+            'pid': timing['pid'],
+            'tid': timing['tid'],
+            'start_seconds': timing['start'] - profiler.origin,
+            'wall_seconds': timing['wall_seconds'],
+            'cpu_seconds': timing['cpu_seconds'],
+            'peak_memory_bytes': 0
+        })
+
+    def summarize(self):
+        """依階段彙總量測結果，維持各階段第一次開始的順序。"""
+        stages = {}
+        for record in self.records:
+            summary = stages.setdefault(record['stage'], {
+                'stage': record['stage'],
+                'depth': record['depth'],
+                'calls': 0,
+                'wall_seconds': 0.0,
+                'cpu_seconds': 0.0,
+                'peak_memory_bytes': 0
+            })
+            summary['calls'] += 1
+            summary['wall_seconds'] += record['wall_seconds']
+            summary['cpu_seconds'] += record['cpu_seconds']
+            summary['peak_memory_bytes'] = max(summary['peak_memory_bytes'], record['peak_memory_bytes'])
+            summary['depth'] = min(summary['depth'], record['depth'])
+        return list(stages.values())
+
+    def to_json(self):
+        """輸出可供程式處理的 JSON 報告。"""
+        return json.dumps({
+            'stages': self.summarize(),
+            'records': [record for record in self.records if record['item'] is not None]
+        }, indent=2, ensure_ascii=False)
+
+    def to_trace_events(self):
+        """輸出 Chrome / Perfetto 可讀取的 trace event JSON。
+
+        每個程序各自成為一條軌道，平行轉換的工作程序會顯示在主程序之外。
+        """
+        main_pid = os.getpid()
+        events = []
+        pids = []
+        for record in self.records:
+            if record['pid'] not in pids:
+                pids.append(record['pid'])
+            name = record['stage'] if record['item'] is None else f"{record['stage']}: {record['item']}"
+            events.append({
+                'name': name,
+                'cat': record['stage'],
+                'ph': 'X',
+                'ts': round(record['start_seconds'] * 1e6, 3),
+                'dur': round(record['wall_seconds'] * 1e6, 3),
+                'pid': record['pid'],
+                'tid': record['tid'],
+                'args': {
+                    'item': record['item'],
+                    'cpu_ms': round(record['cpu_seconds'] * 1e3, 3),
+                    'peak_memory_bytes': record['peak_memory_bytes']
+                }
+            })
+
+        worker_index = 0
+        for pid in pids:
+            if pid == main_pid:
+                process_name = 'build'
+            else:
+                worker_index += 1
+                process_name = f"render worker {worker_index}"
+            events.append({
+                'name': 'process_name',
+                'ph': 'M',
+                'pid': pid,
+                'args': {'name': process_name}
+            })
+            events.append({
+                'name': 'process_sort_index',
+                'ph': 'M',
+                'pid': pid,
+                'args': {'sort_index': 0 if pid == main_pid else worker_index}
+            })
+
+        return json.dumps({'traceEvents': events, 'displayTimeUnit': 'ms'}, ensure_ascii=False)
+
+    def format_table(self):
+        """輸出人類可讀的階段與逐檔量測表格。"""
+        lines = [
+            f"{'Stage':<34}{'Calls':>6}{'Wall (s)':>11}{'CPU (s)':>11}{'Peak mem':>12}",
+            '-' * 74
+        ]
+        for summary in self.summarize():
+            name = '  ' * summary['depth'] + summary['stage']
+            lines.append(
+                f"{name:<34}{summary['calls']:>6}{summary['wall_seconds']:>11.3f}"
+                f"{summary['cpu_seconds']:>11.3f}{BuildProfiler.format_bytes(summary['peak_memory_bytes']):>12}"
+            )
+
+        per_file = [record for record in self.records if record['item'] is not None]
+        if per_file:
+            lines.append('')
+            lines.append(f"{'Stage':<20}{'File':<30}{'Wall (s)':>10}{'CPU (s)':>10}{'Peak mem':>12}")
+            lines.append('-' * 82)
+            for record in per_file:
+                lines.append(
+                    f"{record['stage']:<20}{record['item'][:29]:<30}{record['wall_seconds']:>10.3f}"
+                    f"{record['cpu_seconds']:>10.3f}{BuildProfiler.format_bytes(record['peak_memory_bytes']):>12}"
+                )
+        return '\n'.join(lines)
+
+    @staticmethod
+    def format_bytes(size):
+        """將位元組數轉為易讀格式。"""
+        for unit in ('B', 'KB', 'MB'):
+            if size < 1024:
+                return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+            size /= 1024
+        return f"{size:.1f} GB"
@@ -0,0 +1,118 @@
+import os
+import json
+import hashlib
+import shutil
+import markdown
+import pygments
+
+# 快取格式版本，修改快取內容結構時需遞增
+CACHE_FORMAT_VERSION = 1
+
+
+class RenderCache:
+    def __init__(self, cache_dir, max_bytes, extensions, extension_configs=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extensions = list(extensions)
+        self.extension_configs = extension_configs or {}
+        self.hits = 0
+        self.misses = 0
+        # 目前快取大小的估計值，第一次寫入時才掃描目錄
+        self._total_size = None
+        # 版本與擴充設定相同的內容才能共用快取
+        self.config_fingerprint = json.dumps({
+            'format': CACHE_FORMAT_VERSION,
+            'extensions': self.extensions,
+            'extension_configs': self.extension_configs,
+            'markdown': markdown.__version__,
+            'pygments': pygments.__version__
+        }, sort_keys=True, default=lambda value: getattr(value, '__qualname__', str(value)))
+
+    def make_key(self, content):
+        """根據內容雜湊、擴充設定與函式庫版本產生快取鍵。"""
+        digest = hashlib.sha256()
+        digest.update(self.config_fingerprint.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key):
+        """取得快取項目的檔案路徑。"""
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """讀取快取項目，命中時更新存取時間以維持 LRU 順序。"""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (IOError, ValueError):
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        """寫入快取項目，並在超過容量上限時淘汰最舊的項目。"""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump(entry, file, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except (IOError, OSError) as e:
+            print(f"⚠️ Unable to write render cache entry: {str(e)}")
+            return
+
+        if self._total_size is None:
+            self.evict()
+        else:
+            self._total_size += size
+            if self._total_size > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """依最近存取時間淘汰項目，直到快取大小低於上限。"""
+        entries = []
+        total_size = 0
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total_size += stat.st_size
+
+        self._total_size = total_size
+        if total_size <= self.max_bytes:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+            removed += 1
+        self._total_size = total_size
+        return removed
+
+    def clear(self):
+        """清除整個快取目錄。"""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._total_size = None
@@ -0,0 +1,123 @@
+import os
+import re
+import json
+import hashlib
+from utils.html_template import HTMLTemplate
+from utils.profiler import BuildProfiler
+from utils.precompress import SIDECAR_EXTENSIONS
+
+STYLE_PATTERN = re.compile(r'<style>(.*?)</style>', re.DOTALL)
+INLINE_SCRIPT_PATTERN = re.compile(r'<script>(.*?)</script>', re.DOTALL)
+# 檔名中的內容雜湊長度
+HASH_LENGTH = 10
+
+
+class SplitOutputWriter:
+    """分檔輸出：index.html 外殼、每份文件一個分頁片段，以及以內容雜湊命名的 CSS/JS。
+
+    內容沒有變動的檔案檔名不變，瀏覽器可以長期快取；manifest.json 記錄分頁 id 與片段檔案的對應。
+    """
+
+    def __init__(self, output_dir, minifier=None):
+        self.output_dir = output_dir
+        self.minifier = minifier
+        self.written = 0
+        self.unchanged = 0
+
+    @staticmethod
+    def hashed_name(stem, content, extension):
+        """以內容雜湊產生檔名。"""
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+        return f"{stem}.{digest}.{extension}"
+
+    def write_file(self, relative_path, content, immutable=False):
+        """寫入檔案；檔名含內容雜湊（immutable）的檔案已存在時不重寫，保留原本的修改時間。"""
+        path = os.path.join(self.output_dir, relative_path)
+        if immutable and os.path.exists(path):
+            self.unchanged += 1
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(tmp_path, path)
+        self.written += 1
+
+    def remove_stale(self, directory, keep):
+        """刪除目錄中不再被引用的舊檔案。"""
+        path = os.path.join(self.output_dir, directory)
+        removed = 0
+        if not os.path.isdir(path):
+            return removed
+        for name in os.listdir(path):
+            # 預先壓縮的 .gz / .br 檔跟著原始檔保留
+            source = name[:-3] if name.endswith(SIDECAR_EXTENSIONS) else name
+            if f"{directory}/{source}" in keep:
+                continue
+            try:
+                os.remove(os.path.join(path, name))
+                removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def write(self, files_content, secret_password, finalize=None):
+        """產生並寫入所有檔案，回傳 manifest。
+
+        finalize 會在拆出 CSS/JS 前處理 index.html 外殼（例如內嵌 vendor 資源），
+        處理後的樣式與腳本與其他 CSS/JS 一樣輸出為雜湊命名的檔案。
+        有 minifier 時分頁片段先壓縮再計算雜湊，檔名對應壓縮後的內容。
+        """
+        fragments = {}
+        fragment_files = {}
+        for filename, data in files_content.items():
+            if data.get('is_encrypted'):
+                continue
+            tab_id = HTMLTemplate.tab_id(filename)
+            html = HTMLTemplate.fragment_html(data['content'])
+            if self.minifier is not None:
+                with BuildProfiler.track('minify'):
+                    html = self.minifier.minify_html(html)
+            relative_path = f"fragments/{SplitOutputWriter.hashed_name(tab_id, html, 'html')}"
+            fragments[tab_id] = relative_path
+            fragment_files[relative_path] = html
+
+        with BuildProfiler.track('template assembly'):
+            shell = HTMLTemplate.generate_html_template(files_content, secret_password, fragments=fragments)
+
+        if finalize is not None:
+            shell = finalize(shell)
+
+        # 每段內嵌樣式與腳本各自輸出成一個檔案，維持原本的順序與全域範圍
+        assets = {}
+
+        def extract(extension, template):
+            def replace(match):
+                count = sum(1 for path in assets if path.endswith(f".{extension}"))
+                name = 'app' if not count else f"app-{count}"
+                path = f"assets/{SplitOutputWriter.hashed_name(name, match.group(1), extension)}"
+                assets[path] = match.group(1)
+                return template.format(path=path)
+            return replace
+
+        shell = STYLE_PATTERN.sub(extract('css', '<link href="{path}" rel="stylesheet">'), shell)
+        shell = INLINE_SCRIPT_PATTERN.sub(extract('js', '<script src="{path}"></script>'), shell)
+
+        manifest = {
+            'index': 'index.html',
+            'tabs': fragments,
+            'assets': sorted(assets)
+        }
+        with BuildProfiler.track('write'):
+            for relative_path, content in {**fragment_files, **assets}.items():
+                self.write_file(relative_path, content, immutable=True)
+            self.write_file('index.html', shell)
+            self.write_file('manifest.json', json.dumps(manifest, indent=2, ensure_ascii=False))
+            keep = set(fragment_files) | set(assets)
+            removed = self.remove_stale('fragments', keep) + self.remove_stale('assets', keep)
+
+        total_bytes = sum(len(content.encode('utf-8')) for content in [shell, *fragment_files.values(), *assets.values()])
+        print(f"🧩 Split output: {self.output_dir}/index.html ({BuildProfiler.format_bytes(len(shell.encode('utf-8')))}), "
+              f"{len(fragment_files)} fragment(s), {len(assets)} asset(s), {BuildProfiler.format_bytes(total_bytes)} total")
+        print(f"   {self.written} file(s) written, {self.unchanged} unchanged, {removed} stale file(s) removed")
+        return manifest
@@ -0,0 +1,175 @@
+import os
+import re
+import random
+from collections import Counter
+
+FENCE_PATTERN = re.compile(r'^\s*```(\S*)')
+HEADING_PATTERN = re.compile(r'^(#{1,6}) ')
+
+# content/ 無法讀取時使用的預設統計（取自目前的交接文件）
+DEFAULT_PROFILE = [
+    {'filename': '0. overview.md', 'size': 7165, 'code_ratio': 0.13,
+     'languages': {'dart': 2, '': 2}, 'headings': {1: 1, 2: 8, 3: 15}},
+    {'filename': '1. getting_started.md', 'size': 48233, 'code_ratio': 0.72,
+     'languages': {'': 5, 'dart': 15, 'bash': 10, 'json': 1, 'yaml': 2}, 'headings': {1: 25, 2: 19, 3: 54, 4: 7}},
+    {'filename': '2. assets_and_config.md', 'size': 45260, 'code_ratio': 0.83,
+     'languages': {'': 13, 'yaml': 8, 'dart': 10, 'json': 3, 'bash': 3}, 'headings': {1: 26, 2: 17, 3: 48, 4: 3}},
+    {'filename': '3. widgets.md', 'size': 108065, 'code_ratio': 0.95,
+     'languages': {'dart': 41}, 'headings': {1: 1, 2: 13, 3: 47}},
+    {'filename': '4. data_type.md', 'size': 73766, 'code_ratio': 0.88,
+     'languages': {'dart': 23}, 'headings': {1: 1, 2: 8, 3: 19, 4: 7}},
+    {'filename': '5. project_framework.md', 'size': 19445, 'code_ratio': 0.53,
+     'languages': {'': 12, 'dart': 7}, 'headings': {1: 1, 2: 10, 3: 19, 4: 5}},
+    {'filename': '6. project_design.md', 'size': 128957, 'code_ratio': 0.93,
+     'languages': {'': 1, 'dart': 16}, 'headings': {1: 1, 2: 12, 3: 14}},
+    {'filename': 'secrets.md', 'size': 6361, 'code_ratio': 0.0,
+     'languages': {}, 'headings': {1: 1, 2: 5, 3: 5}},
+]
+
+WORDS = [
+    'Flutter', 'Widget', 'State', '狀態', '元件', '設定', '專案', '畫面', '資料', '非同步',
+    'build', 'context', 'Provider', '路由', '主題', '佈局', '效能', '測試', '套件', 'pubspec'
+]
+IDENTIFIERS = ['user', 'item', 'config', 'theme', 'counter', 'profile', 'order', 'cart', 'route', 'cache']
+
+
+class SyntheticCorpus:
+    @staticmethod
+    def analyze(content_dir):
+        """統計實際文件的大小、程式碼比例、語言分布與標題結構。"""
+        if not os.path.isdir(content_dir):
+            return DEFAULT_PROFILE
+
+        profile = []
+        for filename in sorted(f for f in os.listdir(content_dir) if f.endswith('.md')):
+            with open(os.path.join(content_dir, filename), 'r', encoding='utf-8') as file:
+                content = file.read()
+            languages = Counter()
+            headings = Counter()
+            code_bytes = 0
+            in_fence = False
+            for line in content.split('\n'):
+                fence = FENCE_PATTERN.match(line)
+                if fence:
+                    if not in_fence:
+                        languages[fence.group(1)] += 1
+                    in_fence = not in_fence
+                elif in_fence:
+                    code_bytes += len(line.encode('utf-8')) + 1
+                else:
+                    heading = HEADING_PATTERN.match(line)
+                    if heading:
+                        headings[len(heading.group(1))] += 1
+            size = len(content.encode('utf-8'))
+            profile.append({
+                'filename': filename,
+                'size': size,
+                'code_ratio': code_bytes / size if size else 0.0,
+                'languages': dict(languages),
+                'headings': dict(headings)
+            })
+        return profile or DEFAULT_PROFILE
+
+    @staticmethod
+    def generate(profile, scale, seed=2024):
+        """依統計資料產生放大 scale 倍的 Markdown 語料，回傳 (文件名, 內容) 清單。"""
+        documents = []
+        for index, spec in enumerate(profile):
+            rng = random.Random(f"{seed}:{index}:{spec['filename']}")
+            target = max(int(spec['size'] * scale), 256)
+            documents.append((spec['filename'], SyntheticCorpus._generate_document(rng, spec, target)))
+        return documents
+
+    @staticmethod
+    def write(documents, target_dir):
+        """將語料寫入目錄。"""
+        os.makedirs(target_dir, exist_ok=True)
+        for filename, content in documents:
+            with open(os.path.join(target_dir, filename), 'w', encoding='utf-8') as file:
+                file.write(content)
+
+    @staticmethod
+    def _generate_document(rng, spec, target):
+        """產生單一文件：標題、段落與程式碼區塊的比例依照原始文件。"""
+        heading_levels = [level for level, count in spec['headings'].items() for _ in range(count)] or [2]
+        languages = [language for language, count in spec['languages'].items() for _ in range(count)]
+        code_ratio = spec['code_ratio']
+
+        parts = [f"# {SyntheticCorpus._sentence(rng, 3)}\n"]
+        size = len(parts[0].encode('utf-8'))
+        code_size = 0
+        while size < target:
+            level = max(rng.choice(heading_levels), 2)
+            block = f"{'#' * level} {SyntheticCorpus._sentence(rng, 4)}\n"
+            if languages and code_size < code_ratio * size:
+                language = rng.choice(languages)
+                code = SyntheticCorpus._code_block(rng, language)
+                code_size += len(code.encode('utf-8'))
+                block += f"\n```{language}\n{code}```\n"
+            else:
+                block += f"\n{SyntheticCorpus._paragraph(rng)}\n"
+            parts.append(block)
+            size += len(block.encode('utf-8')) + 1
+        return '\n'.join(parts)
+
+    @staticmethod
+    def _sentence(rng, words):
+        """產生中英混合的短句。"""
+        return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+    @staticmethod
+    def _paragraph(rng):
+        """產生包含清單、行內程式碼與粗體的段落。"""
+        lines = [
+            f"{SyntheticCorpus._sentence(rng, 12)}，使用 `{rng.choice(IDENTIFIERS)}` 以及 **{rng.choice(WORDS)}**。"
+        ]
+        for _ in range(rng.randint(0, 4)):
+            lines.append(f"- {SyntheticCorpus._sentence(rng, 6)}")
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def _code_block(rng, language):
+        """依語言產生程式碼內容；未標註語言的區塊混合目錄樹、指令與設定。"""
+        name = rng.choice(IDENTIFIERS)
+        cls = name.capitalize() + rng.choice(['Page', 'Widget', 'Model', 'Service'])
+        if language == 'dart':
+            fields = '\n'.join(
+                f"  final {rng.choice(['String', 'int', 'bool', 'double'])} {rng.choice(IDENTIFIERS)}{i};"
+                for i in range(rng.randint(1, 6))
+            )
+            return (
+                f"class {cls} extends StatelessWidget {{\n{fields}\n\n"
+                f"  const {cls}({{super.key}});\n\n"
+                "  @override\n"
+                "  Widget build(BuildContext context) {\n"
+                "    return Scaffold(\n"
+                f"      appBar: AppBar(title: const Text('{cls}')),\n"
+                "      body: Padding(\n"
+                "        padding: const EdgeInsets.all(16),\n"
+                f"        child: Text('{SyntheticCorpus._sentence(rng, 3)}'),\n"
+                "      ),\n"
+                "    );\n"
+                "  }\n"
+                "}\n"
+            )
+        if language == 'yaml':
+            return (
+                f"name: {name}_app\n"
+                "dependencies:\n"
+                "  flutter:\n"
+                "    sdk: flutter\n"
+                f"  {name}: ^{rng.randint(1, 5)}.{rng.randint(0, 9)}.0\n"
+                "flutter:\n"
+                "  assets:\n"
+                f"    - assets/images/{name}.png\n"
+            )
+        if language == 'bash':
+            return f"flutter pub get\nflutter run -d {rng.choice(['chrome', 'android', 'ios'])}\n"
+        if language == 'json':
+            return f'{{\n  "{name}": {rng.randint(0, 999)},\n  "enabled": true\n}}\n'
+        choice = rng.randint(0, 2)
+        if choice == 0:
+            return f"lib/\n├── main.dart\n├── {name}/\n│   └── {name}_page.dart\n└── widgets/\n"
+        if choice == 1:
+            return f"flutter pub add {name}\nflutter pub get\n"
+        return f"{name}:\n  enabled: true\n  retries: {rng.randint(1, 5)}\n"
@@ -0,0 +1,219 @@
+import os
+import re
+import base64
+import argparse
+import mimetypes
+import urllib.request
+from urllib.parse import urljoin, urlsplit
+from utils.config import Config
+
+ASSET_PATTERN = re.compile(
+    r'<(?P<tag>link|script)\b(?P<before>[^>]*?)\b(?:href|src)="(?P<url>https?://[^"]+)"(?P<after>[^>]*)>(?:</script>)?'
+)
+CSS_URL_PATTERN = re.compile(r'url\((["\']?)(?P<ref>[^)"\']+)\1\)')
+FONT_SRC_PATTERN = re.compile(r'src:(?P<sources>[^;}]+)')
+FONT_SOURCE_PATTERN = re.compile(r'url\([^)]+\)\s*format\("(?P<format>[\w-]+)"\)')
+LANGUAGE_CLASS_PATTERN = re.compile(r'class="language-([\w+#-]+)"')
+
+PRISM_AUTOLOADER = 'plugins/autoloader/prism-autoloader.min.js'
+# 文件語言對應的 Prism 元件（依載入順序列出相依元件）
+PRISM_COMPONENTS = {
+    'dart': ['clike', 'dart'],
+    'yaml': ['yaml'],
+    'yml': ['yaml'],
+    'bash': ['bash'],
+    'shell': ['bash'],
+    'sh': ['bash'],
+    'json': ['json'],
+    'html': ['markup'],
+    'xml': ['markup'],
+    'kotlin': ['clike', 'kotlin'],
+    'swift': ['swift'],
+    'java': ['clike', 'java'],
+    'javascript': ['clike', 'javascript'],
+    'js': ['clike', 'javascript'],
+}
+
+
+class AssetVendor:
+    """將 CDN 資源改由本機 vendor 目錄提供。
+
+    vendor 目錄依網址存放檔案，例如
+    https://cdn.jsdelivr.net/npm/prismjs@1.29.0/components/prism-core.min.js 對應
+    vendor/cdn.jsdelivr.net/npm/prismjs@1.29.0/components/prism-core.min.js。
+    找不到本機檔案的資源保留原本的 CDN 連結。
+    """
+
+    def __init__(self, vendor_dir, languages=None):
+        self.vendor_dir = vendor_dir
+        self.languages = list(Config.VENDOR_PRISM_LANGUAGES)
+        for language in sorted(languages or []):
+            if language not in self.languages:
+                self.languages.append(language)
+        self.inlined = []
+        self.missing = []
+
+    def local_path(self, url):
+        """取得網址對應的本機檔案路徑。"""
+        parts = urlsplit(url)
+        return os.path.join(self.vendor_dir, parts.netloc, *parts.path.lstrip('/').split('/'))
+
+    def read(self, url):
+        """讀取本機資源，不存在時回傳 None。"""
+        try:
+            with open(self.local_path(url), 'rb') as file:
+                return file.read()
+        except (IOError, OSError):
+            return None
+
+    @staticmethod
+    def code_languages(files_content):
+        """收集公開文件中程式碼區塊使用的語言。"""
+        languages = set()
+        for data in files_content.values():
+            if not data.get('is_encrypted'):
+                languages.update(LANGUAGE_CLASS_PATTERN.findall(data['content']))
+        return languages
+
+    def prism_component_urls(self, autoloader_url):
+        """依文件語言列出需要預先載入的 Prism 元件網址（取代 autoloader 執行時下載）。"""
+        base = autoloader_url[:-len(PRISM_AUTOLOADER)]
+        components = []
+        for language in self.languages:
+            for component in PRISM_COMPONENTS.get(language, []):
+                if component not in components:
+                    components.append(component)
+        return [f"{base}components/prism-{component}.min.js" for component in components]
+
+    def inline_css(self, url, css):
+        """將 CSS 中引用的字型與圖片轉成 data URI；同一組字型有 woff2 時省略其他格式。"""
+        def drop_fallback_fonts(match):
+            sources = match.group('sources')
+            if 'format("woff2")' not in sources:
+                return match.group(0)
+            kept = [source.group(0) for source in FONT_SOURCE_PATTERN.finditer(sources)
+                    if source.group('format') == 'woff2']
+            return f"src:{','.join(kept)}"
+
+        def embed(match):
+            reference = match.group('ref')
+            if reference.startswith('data:'):
+                return match.group(0)
+            resource_url = urljoin(url, reference).split('#')[0].split('?')[0]
+            data = self.read(resource_url)
+            if data is None:
+                self.missing.append(resource_url)
+                return f'url({resource_url})'
+            mime_type = mimetypes.guess_type(resource_url)[0] or 'application/octet-stream'
+            if resource_url.endswith('.woff2'):
+                mime_type = 'font/woff2'
+            return f"url(data:{mime_type};base64,{base64.b64encode(data).decode('ascii')})"
+
+        css = FONT_SRC_PATTERN.sub(drop_fallback_fonts, css)
+        return CSS_URL_PATTERN.sub(embed, css)
+
+    def inline_script(self, url):
+        """讀取腳本並轉成內嵌 <script>，找不到時回傳 None。"""
+        data = self.read(url)
+        if data is None:
+            self.missing.append(url)
+            return None
+        self.inlined.append(url)
+        script = data.decode('utf-8').replace('</script', '<\\/script')
+        return f'<script>{script}</script>'
+
+    def vendor_html(self, html):
+        """將 HTML 中的 CDN <link>/<script> 改為內嵌的本機資源。"""
+        def replace(match):
+            url = match.group('url')
+            if match.group('tag') == 'link':
+                data = self.read(url)
+                if data is None:
+                    self.missing.append(url)
+                    return match.group(0)
+                self.inlined.append(url)
+                css = self.inline_css(url, data.decode('utf-8')).replace('</style', '<\\/style')
+                return f'<style>{css}</style>'
+
+            if url.endswith(PRISM_AUTOLOADER):
+                scripts = [self.inline_script(component) for component in self.prism_component_urls(url)]
+                if not all(scripts):
+                    # 缺少語法元件時保留 autoloader，只有尚未內嵌的語法會在執行時下載
+                    scripts = [script for script in scripts if script] + [match.group(0)]
+                return '\n    '.join(scripts)
+
+            return self.inline_script(url) or match.group(0)
+
+        return ASSET_PATTERN.sub(replace, html)
+
+    def report(self):
+        """輸出內嵌與缺少的資源。"""
+        print(f"📦 Vendored {len(self.inlined)} asset(s) from {self.vendor_dir}")
+        for url in sorted(set(self.missing)):
+            print(f"⚠️ Missing vendored asset, keeping CDN reference: {url}")
+
+    def fetch(self, urls):
+        """從 CDN 下載資源到 vendor 目錄（CSS 引用的字型一併下載）。"""
+        pending = list(urls)
+        seen = set()
+        while pending:
+            url = pending.pop(0)
+            if url in seen:
+                continue
+            seen.add(url)
+            path = self.local_path(url)
+            if not os.path.exists(path):
+                try:
+                    with urllib.request.urlopen(url, timeout=30) as response:
+                        data = response.read()
+                except OSError as e:
+                    print(f"❌ Error downloading {url}: {str(e)}")
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as file:
+                    file.write(data)
+                print(f"⬇️ {url}")
+            if url.endswith('.css'):
+                with open(path, 'r', encoding='utf-8') as file:
+                    css = file.read()
+                for match in CSS_URL_PATTERN.finditer(css):
+                    if not match.group('ref').startswith('data:'):
+                        pending.append(urljoin(url, match.group('ref')).split('#')[0].split('?')[0])
+
+
+def main():
+    """下載建置時會用到的 CDN 資源與圖示 SVG 到 vendor 目錄。"""
+    from utils.html_template import HTMLTemplate
+    from utils.highlight_strategy import HighlightStrategy, STRATEGIES
+    from utils.icon_sprite import IconSprite
+
+    parser = argparse.ArgumentParser(description='下載 CDN 資源到 vendor 目錄，供離線建置使用')
+    parser.add_argument('--vendor-dir', default=Config.VENDOR_DIR,
+                        help='vendor 目錄')
+    parser.add_argument('--languages', nargs='+', default=sorted(PRISM_COMPONENTS),
+                        help='要預先下載的 Prism 語法（預設為所有已知語法）')
+    args = parser.parse_args()
+
+    vendor = AssetVendor(args.vendor_dir, args.languages)
+    # 包含 secrets 分頁，讓解密介面用到的腳本與圖示也一併收集
+    sample = {
+        '0.md': {'title': 'Sample', 'content': '', 'is_encrypted': False, 'order': 0},
+        'secrets.md': {'title': '', 'original_title': 'Secrets', 'content': '', 'encrypted_content': '',
+                       'is_encrypted': True, 'is_hidden': True, 'order': 999},
+    }
+    urls = []
+    for strategy in STRATEGIES:
+        HighlightStrategy.use(strategy)
+        html = HTMLTemplate.generate_html_template(sample, Config.SECRET_PASSWORD)
+        for match in ASSET_PATTERN.finditer(html):
+            url = match.group('url')
+            urls.append(url)
+            if url.endswith(PRISM_AUTOLOADER):
+                urls.extend(vendor.prism_component_urls(url))
+        # 圖示 sprite 使用的 Font Awesome SVG
+        urls.extend(IconSprite.svg_url(style, name) for name, style in IconSprite.icons(html).items())
+    vendor.fetch(urls)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import os
+import time
+from utils.config import Config
+from utils.markdown_processor import MarkdownProcessor
+from utils.code_language import CodeLanguageResolver
+
+
+class DocsWatcher:
+    def __init__(self, builder, interval=None, debounce=None):
+        self.builder = builder
+        self.interval = Config.WATCH_INTERVAL if interval is None else interval
+        self.debounce = Config.WATCH_DEBOUNCE if debounce is None else debounce
+        self.files_content = {}
+
+    def snapshot(self):
+        """記錄內容目錄中每個 Markdown 文件的修改時間與大小。"""
+        state = {}
+        try:
+            with os.scandir(self.builder.content_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.md'):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    state[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            print(f"❌ Error scanning {self.builder.content_dir}: {str(e)}")
+        return state
+
+    def wait_until_settled(self, state):
+        """等待文件在 debounce 期間內不再變動，避免編輯器連續存檔觸發多次建置。"""
+        while True:
+            time.sleep(self.debounce)
+            current = self.snapshot()
+            if current == state:
+                return current
+            state = current
+
+    def rebuild(self, previous, current):
+        """只重新處理有變動的文件，再透過 HTML 模板組合輸出。"""
+        start = time.perf_counter()
+        changed = sorted(
+            (filename for filename in current if previous.get(filename) != current[filename]),
+            key=MarkdownProcessor.extract_order_from_filename
+        )
+        removed = [filename for filename in previous if filename not in current]
+
+        for filename in removed:
+            self.files_content.pop(filename, None)
+
+        documents = MarkdownProcessor.read_documents(self.builder.content_dir, changed)
+        self.files_content.update(MarkdownProcessor.process_documents(
+            documents, self.builder.secret_password, self.builder.cache, self.builder.workers,
+            CodeLanguageResolver.default_language_for(self.builder.content_dir)
+        ))
+
+        if not self.files_content:
+            print("❌ Error: No Markdown files found")
+            return
+        if not self.builder.write_output(self.files_content):
+            return
+
+        elapsed = time.perf_counter() - start
+        summary = ', '.join(changed + [f"-{filename}" for filename in removed])
+        print(f"🔄 Rebuilt {self.builder.output_file} in {elapsed:.2f}s ({summary})")
+
+    def run(self):
+        """執行完整建置後持續監看內容目錄，有變動時增量重建。"""
+        state = self.snapshot()
+        self.files_content = self.builder.build() or {}
+        print(f"\n👀 Watching {self.builder.content_dir} for changes (Ctrl+C to stop)...")
+
+        try:
+            while True:
+                time.sleep(self.interval)
+                current = self.snapshot()
+                if current == state:
+                    continue
+                current = self.wait_until_settled(current)
+                self.rebuild(state, current)
+                state = current
+        except KeyboardInterrupt:
+            print("\n👋 Stopped watching")